@@ -1,12 +1,21 @@
 __all__ = [
+    "async_pipeline",
     "config",
     "dispatcher",
     "events",
+    "fingerprint",
+    "fsutil",
     "git_adapter",
+    "git_async",
+    "ignore",
+    "isolation",
     "logger",
+    "metrics",
     "pipeline",
     "plugins",
+    "policy",
     "state",
+    "supervisor",
     "watcher",
 ]
 
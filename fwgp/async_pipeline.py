@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+from fwgp import events
+from fwgp.dispatcher import Dispatcher
+from fwgp.git_adapter import GitError, StatusSnapshot
+from fwgp.git_async import AsyncGit
+from fwgp.pipeline import DEFAULT_COMMIT_MESSAGE, BasePipeline
+
+
+class AsyncPipeline(BasePipeline):
+    """``Pipeline`` driven by a coroutine so one process can watch many repos.
+
+    Git runs through a shared ``AsyncGit`` (bounded subprocess concurrency);
+    watcher polls and plugin hooks, which are blocking, run in the default
+    executor. Batching and remote backoff follow the threaded pipeline.
+    """
+
+    def __init__(self, repo_path: str, dispatcher: Dispatcher, logger, git: Optional[AsyncGit] = None,
+                 add_chunk_size: int = 10000, **kwargs):
+        kwargs.pop("persistent_git", None)
+        super().__init__(repo_path, dispatcher, logger, **kwargs)
+        self.agit = git or AsyncGit()
+        self.add_chunk_size = add_chunk_size
+        self._alock: Optional[asyncio.Lock] = None
+        self._sync_wake: Optional[asyncio.Event] = None
+
+    async def run(self):
+        self._running = True
+        self._alock = asyncio.Lock()
+        self._sync_wake = asyncio.Event()
+        self.logger.info("Watcher initialized for %s", self.repo_path)
+        sync_task = asyncio.create_task(self._remote_loop())
+        try:
+            while self._running:
+                try:
+                    changes = await asyncio.to_thread(self.watcher.poll_changes)
+                    if changes:
+                        await self._process_changes(changes, self._ctx())
+                    elif self._batch_due():
+                        await self._flush_batch(self._ctx())
+                except Exception as e:
+                    self.logger.error("Pipeline error: %s", e)
+                if self._running:
+                    await asyncio.sleep(self._batch_wait(self.interval_sec))
+        finally:
+            self._running = False
+            sync_task.cancel()
+            try:
+                await sync_task
+            except asyncio.CancelledError:
+                pass
+            if self._batch:
+                await self._flush_batch(self._ctx())
+
+    async def _remote_loop(self):
+        interval = self.sync_interval_sec
+        delay = interval
+        while True:
+            try:
+                active = await self._sync_remote(self._ctx())
+            except Exception as e:
+                self.logger.error("Remote sync error: %s", e)
+                active = False
+            delay = interval if active else min(delay * 2, self.max_sync_interval_sec)
+            deadline = time.monotonic() + delay
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._sync_wake.clear()
+                try:
+                    await asyncio.wait_for(self._sync_wake.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                # Local activity: peers are likely active too
+                delay = interval
+                deadline = min(deadline, time.monotonic() + interval)
+
+    async def _sync_remote(self, ctx: Dict[str, object]) -> bool:
+        # Same phases as Pipeline._sync_remote
+        pull_req = self._pull_request(ctx)
+        if pull_req is None:
+            return False
+        updated = False
+        allow_pull, strategy = await asyncio.to_thread(self.dispatcher.before_pull, pull_req, ctx)
+        if allow_pull:
+            fetched = None
+            try:
+                await self.agit.fetch(self.repo_path, pull_req.remote, pull_req.branch)
+                fetched = await self.agit.rev_parse(self.repo_path, "FETCH_HEAD")
+            except GitError as ge:
+                self.logger.warning("git fetch failed: %s", ge)
+            if fetched and fetched != self._last_fetched:
+                async with self._alock:
+                    merged, updated = await self._merge(fetched)
+                if merged:
+                    self._last_fetched = fetched
+        try:
+            snapshot = await self.agit.status(self.repo_path)
+        except GitError as ge:
+            self.logger.warning("git status failed: %s", ge)
+            snapshot = StatusSnapshot()
+        conflicts = self._conflicts(snapshot, allow_pull, ctx)
+        if allow_pull and conflicts:
+            await asyncio.to_thread(self.dispatcher.on_conflict, events.ConflictInfo(files=conflicts), ctx)
+        await asyncio.to_thread(self.dispatcher.after_pull,
+                                events.PullResult(updated=updated, conflicts=conflicts or None), ctx)
+        return updated or bool(conflicts)
+
+    async def _merge(self, fetched: str) -> Tuple[bool, bool]:
+        # Caller holds the git lock; returns (merged, HEAD moved)
+        before = await self.agit.head_sha(self.repo_path)
+        merged = True
+        try:
+            await self.agit.merge(self.repo_path, fetched, ff_only=True)
+        except GitError:
+            try:
+                await self.agit.merge(self.repo_path, fetched)
+            except GitError as ge:
+                self.logger.warning("git merge failed: %s", ge)
+                merged = False
+        return merged, await self.agit.head_sha(self.repo_path) != before
+
+    async def _process_changes(self, changes: List[events.FileDetectedEvent], ctx: Dict[str, object]):
+        await asyncio.to_thread(self.dispatcher.on_files_detected, changes, ctx)
+        self._enqueue(changes)
+        if self._batch_due():
+            await self._flush_batch(ctx)
+
+    async def _flush_batch(self, ctx: Dict[str, object]):
+        batch = self._take_batch()
+        async with self._alock:
+            await self._stage_commit_push(batch, ctx)
+        self._sync_wake.set()
+
+    async def _stage_commit_push(self, changes: List[events.FileDetectedEvent], ctx: Dict[str, object]):
+        # Same phases as Pipeline._stage_commit_push
+        paths = self._stage_paths(changes)
+        stage_req = events.StageRequest(paths=paths, repo=self.repo_path, ctx={})
+        allow, reasons = await asyncio.to_thread(self.dispatcher.before_stage, stage_req, ctx)
+        if not allow:
+            self.logger.warning("Stage blocked by plugins: %s", "; ".join(reasons) or "no reason")
+            return
+        try:
+            self._log_staged(paths, await self.agit.add(self.repo_path, paths, chunk_size=self.add_chunk_size))
+        except GitError as ge:
+            self.logger.error("git add failed: %s", ge)
+            self._requeue(changes)
+            return
+        await asyncio.to_thread(self.dispatcher.after_stage, stage_req, ctx)
+
+        try:
+            snapshot = await self.agit.status(self.repo_path)
+        except GitError as ge:
+            self.logger.error("git status failed: %s", ge)
+            return
+        allow, msg_override, sign = await asyncio.to_thread(
+            self.dispatcher.before_commit, self._commit_request(changes, snapshot, ctx), ctx
+        )
+        if not allow:
+            self.logger.warning("Commit blocked by plugins")
+            return
+        try:
+            sha = await self.agit.commit(self.repo_path, msg_override or DEFAULT_COMMIT_MESSAGE, sign=bool(sign))
+        except GitError as ge:
+            self.logger.error("git commit failed: %s", ge)
+            return
+        self._log_commit(sha)
+        await asyncio.to_thread(self.dispatcher.after_commit, sha, ctx)
+
+        push_req = self._push_request(ctx)
+        if push_req is not None:
+            allow_push, force = await asyncio.to_thread(self.dispatcher.before_push, push_req, ctx)
+            if allow_push:
+                try:
+                    await self.agit.push(self.repo_path, push_req.remote, push_req.branch, force=bool(force))
+                    self.logger.info("Pushed to %s/%s", push_req.remote, push_req.branch)
+                except GitError as ge:
+                    self.logger.warning("git push failed: %s", ge)
+            await asyncio.to_thread(self.dispatcher.after_push, push_req, ctx)
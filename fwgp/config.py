@@ -13,6 +13,13 @@ DEFAULT_PLUGINS = [
 ]
 
 
+@dataclass
+class RepoConfig:
+    repo_path: str
+    remote: str = "origin"
+    branch: str = "main"
+
+
 @dataclass
 class Config:
     base_dir: str
@@ -20,11 +27,34 @@ class Config:
     remote: str = "origin"
     branch: str = "main"
     polling_interval_sec: float = 2.0
+    sync_interval_sec: float = 2.0
+    max_sync_interval_sec: float = 300.0
+    batch_max_wait_sec: float = 0.0
+    batch_max_files: int = 0
+    batch_max_bytes: int = 0
+    persistent_git: bool = False
+    incremental_polling: bool = False
+    content_fingerprints: bool = False
+    respect_gitignore: bool = True
+    event_quiet_sec: float = 0.2
+    event_max_pending: int = 10000
+    event_max_wait_sec: float = 2.0
     enabled_plugins: List[str] = None
+    # Supervisor mode: several repos in one process
+    repositories: List[RepoConfig] = None
+    git_max_concurrency: int = 8
+    dispatcher_workers: int = 8
+    notify_queue_size: int = 1000
+    plugin_isolation: str = "thread"  # or "process"
+    poll_workers: int = 8
+    state_backend: str = "json"  # or "journal"
 
     def __post_init__(self):
         if self.enabled_plugins is None:
             self.enabled_plugins = list(DEFAULT_PLUGINS)
+        if self.repositories is None:
+            self.repositories = []
+        self.repositories = [r if isinstance(r, RepoConfig) else RepoConfig(**r) for r in self.repositories]
 
 
 def _config_path(base_dir: str) -> Path:
@@ -38,6 +68,7 @@ def load_config(base_dir: str) -> Config:
     if not p.exists():
         return Config(base_dir=base_dir)
     data = json.loads(p.read_text(encoding="utf-8"))
+    data.pop("base_dir", None)
     return Config(base_dir=base_dir, **data)
 
 
@@ -3,13 +3,13 @@ from __future__ import annotations
 import json
 import sys
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional
 
 
 REQUIRED_FIELDS = {"name", "module", "class", "version"}
 
 
-def discover_plugins(plugins_dir: str, logger) -> List[str]:
+def discover_plugins(plugins_dir: str, logger, budgets: Optional[Dict[str, Dict[str, Any]]] = None) -> List[str]:
     specs: List[str] = []
     pdir = Path(plugins_dir)
     if not pdir.exists():
@@ -27,6 +27,8 @@ def discover_plugins(plugins_dir: str, logger) -> List[str]:
             cls = data["class"]
             spec = f"{module}:{cls}"
             specs.append(spec)
+            if budgets is not None and isinstance(data.get("budgets"), dict):
+                budgets[spec] = data["budgets"]
             logger.info("Discovered plugin: %s (%s)", data.get("name"), spec)
         except Exception as e:
             logger.error("Failed to read manifest %s: %s", manifest, e)
@@ -1,11 +1,19 @@
 from __future__ import annotations
 
 import importlib
-from concurrent.futures import ThreadPoolExecutor, TimeoutError
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from concurrent.futures import wait as wait_futures
 from dataclasses import dataclass
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from fwgp import events
+from fwgp.isolation import ProcessPlugin
+from fwgp.metrics import PluginMetrics
+from fwgp.plugins.base import BasePlugin
+from fwgp.policy import PerformancePolicy, PluginBudget
 from fwgp.state import StateStore
 
 
@@ -15,54 +23,405 @@ class LoadedPlugin:
     instance: Any
 
 
+class NotificationQueue:
+    """Bounded FIFO of pending notification hooks for one plugin.
+
+    A single worker thread drains it in order. When full, the oldest entry
+    is dropped so the producer never blocks; ``dropped`` counts those.
+    ``close`` delivers what is still queued and stops the worker.
+    """
+
+    def __init__(self, deliver: Callable[[str, tuple], None], capacity: int, name: str, logger=None):
+        self.deliver = deliver
+        self.capacity = max(1, capacity)
+        self.name = name
+        self.logger = logger
+        self.dropped = 0
+        self._items: deque = deque()
+        self._busy = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def depth(self) -> int:
+        return len(self._items)
+
+    def put(self, method: str, args: tuple) -> None:
+        with self._cond:
+            if self._closed:
+                self.dropped += 1
+                return
+            if len(self._items) >= self.capacity:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append((method, args))
+            self._cond.notify_all()
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._items and not self._busy, timeout)
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Stop accepting work and wait for the backlog; False on timeout."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._items or self._closed)
+                if not self._items:
+                    return
+                method, args = self._items.popleft()
+                self._busy = True
+            try:
+                self.deliver(method, args)
+            except Exception as e:
+                # e.g. the pool shutting down; keep the worker alive
+                if self.logger is not None:
+                    self.logger.error("Notification %s on %s failed: %s", method, self.name, e)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+
 class Dispatcher:
-    def __init__(self, state: StateStore, logger, timeout_sec: float = 2.0):
+    def __init__(self, state: StateStore, logger, timeout_sec: Optional[float] = None, max_workers: int = 8,
+                 notify_queue_size: int = 1000, isolation: str = "thread", plugin_workers: Optional[int] = None,
+                 metrics: Optional[PluginMetrics] = None, policy: Optional[PerformancePolicy] = None,
+                 notify_workers: int = 4):
         self.state = state
         self.logger = logger
-        self.timeout_sec = timeout_sec
+        # policy/performance.yml budgets; latency max is the default timeout
+        self.policy = policy or PerformancePolicy()
+        self.timeout_sec = timeout_sec if timeout_sec is not None else self.policy.latency_max_ms / 1000.0
+        self.metrics = metrics or PluginMetrics()
+        # "thread" runs plugins in-process; "process" gives each plugin
+        # killable worker processes so timeouts free the pool thread.
+        self.isolation = isolation
+        self.plugin_workers = plugin_workers if plugin_workers is not None else self.policy.plugin_workers
         self.plugins: List[LoadedPlugin] = []
-        self.pool = ThreadPoolExecutor(max_workers=8)
+        self.pool = ThreadPoolExecutor(max_workers=max_workers)
+        # Notifications run on their own threads, at most one per plugin at
+        # a time, so hung advisory plugins cannot starve decision hooks
+        self.notify_pool = ThreadPoolExecutor(max_workers=notify_workers, thread_name_prefix="fwgp-notify")
+        self._inflight: Dict[str, Future] = {}
+        self.notify_queue_size = notify_queue_size
+        self._queues: Dict[str, NotificationQueue] = {}
+        self._queues_lock = threading.Lock()
+        self._budgets: Dict[str, PluginBudget] = {}
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._budgets_lock = threading.Lock()
+        # Set when several repositories share this dispatcher, so a plugin
+        # failing on one repo does not trip its circuit for the others.
+        self.circuit_per_repo = False
 
-    def load_plugins(self, plugin_specs: List[str]) -> None:
+    def load_plugins(self, plugin_specs: List[str], budgets: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        # budgets: per-spec overrides from JSON manifests; a class-level
+        # PluginManifest.budgets is used when a spec has none.
+        self.close_plugins()
         self.plugins.clear()
+        self._budgets.clear()
+        self._slots.clear()
         for spec in plugin_specs:
             try:
                 module_name, class_name = spec.split(":", 1)
-                module = importlib.import_module(module_name)
-                cls = getattr(module, class_name)
-                inst = cls()
+                cls = getattr(importlib.import_module(module_name), class_name)
+                overrides = (budgets or {}).get(spec) or getattr(getattr(cls, "manifest", None), "budgets", None)
+                budget = self.budget_for(overrides)
+                if self.isolation == "process":
+                    inst = ProcessPlugin(
+                        spec,
+                        budget.timeout_ms / 1000.0,
+                        workers=min(self.plugin_workers, budget.max_concurrency),
+                        max_memory_mb=budget.max_memory_mb,
+                        on_rss=lambda method, rss, key=spec, b=budget: self._check_memory(key, method, rss, b),
+                    )
+                else:
+                    inst = cls()
+                self._budgets[spec] = budget
                 self.plugins.append(LoadedPlugin(key=spec, instance=inst))
                 self.logger.info("Loaded plugin: %s", spec)
             except Exception as e:
                 self.logger.error("Failed to load plugin %s: %s", spec, e)
 
-    def _call(self, plugin: LoadedPlugin, method: str, *args, **kwargs):
-        if self.state.is_disabled(plugin.key):
+    def budget_for(self, overrides: Optional[Dict[str, Any]] = None) -> PluginBudget:
+        budget = self.policy.budget_for(overrides)
+        if not ((overrides or {}).get("latency_ms") or {}).get("max"):
+            budget.timeout_ms = self.timeout_sec * 1000.0
+        budget.latency_ms = min(budget.latency_ms, budget.timeout_ms)
+        return budget
+
+    def _budget(self, plugin: LoadedPlugin) -> PluginBudget:
+        with self._budgets_lock:
+            budget = self._budgets.get(plugin.key)
+            if budget is None:
+                budget = self._budgets[plugin.key] = self.budget_for()
+            return budget
+
+    def _slots_for(self, plugin: LoadedPlugin) -> threading.BoundedSemaphore:
+        budget = self._budget(plugin)
+        with self._budgets_lock:
+            slots = self._slots.get(plugin.key)
+            if slots is None:
+                slots = self._slots[plugin.key] = threading.BoundedSemaphore(budget.max_concurrency)
+            return slots
+
+    def _violation(self, key: str, method: str, kind: str, value: float, limit: float) -> None:
+        self.metrics.violation(key, kind)
+        self.logger.warning("Plugin %s.%s over %s budget: %.1f > %.1f", key, method, kind, value, limit)
+        if method != events.Hook.ON_BUDGET_VIOLATION.value:
+            self._notify(events.Hook.ON_BUDGET_VIOLATION.value,
+                         events.BudgetViolation(plugin=key, hook=method, kind=kind, value=value, limit=limit),
+                         {"logger": self.logger})
+
+    def _check_memory(self, key: str, method: str, rss_mb: float, budget: PluginBudget) -> None:
+        if rss_mb > budget.max_memory_mb:
+            self._violation(key, method, "memory", rss_mb, budget.max_memory_mb)
+        elif rss_mb > budget.memory_mb:
+            self._violation(key, method, "memory", rss_mb, budget.memory_mb)
+
+    def _acquire(self, plugin: LoadedPlugin, method: str, timeout: float) -> Optional[threading.BoundedSemaphore]:
+        # Per-plugin concurrency cap; waiting counts against the call's timeout
+        slots = self._slots_for(plugin)
+        if slots.acquire(timeout=max(0.0, timeout)):
+            return slots
+        self._violation(plugin.key, method, "concurrency", self._budget(plugin).max_concurrency,
+                        self._budget(plugin).max_concurrency)
+        return None
+
+    def close_plugins(self, timeout: float = 5.0) -> None:
+        # Deliver queued notifications first; the plugins may go away next
+        deadline = time.monotonic() + timeout
+        with self._queues_lock:
+            queues = list(self._queues.values())
+            self._queues.clear()
+        for q in queues:
+            if not q.close(max(0.0, deadline - time.monotonic())):
+                self.logger.warning("Notification queue %s not drained; %d dropped", q.name, q.depth)
+        # Plugins may hold processes or pools; an optional close() frees them
+        for plugin in self.plugins:
+            close = getattr(plugin.instance, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception as e:
+                    self.logger.error("Plugin %s close failed: %s", plugin.key, e)
+
+    def _circuit(self, plugin: LoadedPlugin, args: tuple) -> str:
+        # Breaker key: the plugin, or plugin@repo from the hook's ctx
+        ctx = args[-1] if args and isinstance(args[-1], dict) else {}
+        if self.circuit_per_repo and ctx.get("repo_path"):
+            return f"{plugin.key}@{ctx['repo_path']}"
+        return plugin.key
+
+    def _call(self, plugin: LoadedPlugin, method: str, *args, notification: bool = False, **kwargs):
+        ck = self._circuit(plugin, args)
+        if self.state.is_open(ck, method):
             return None
         fn = getattr(plugin.instance, method, None)
         if not callable(fn):
             return None
-        fut = self.pool.submit(fn, *args, **kwargs)
+        budget = self._budget(plugin)
+        deadline = time.monotonic() + budget.timeout_ms / 1000.0
+        slots = self._admit(plugin, ck, method, budget.timeout_ms / 1000.0)
+        if slots is None:
+            return None
+        pool = self.notify_pool if notification else self.pool
+        fut = pool.submit(self._timed, plugin, slots, method, fn, *self._with_deadline(args, deadline), **kwargs)
+        if notification:
+            self._inflight[plugin.key] = fut
         try:
-            return fut.result(timeout=self.timeout_sec)
+            result = fut.result(timeout=max(0.0, deadline - time.monotonic()))
+            self.state.record_success(ck, method)
+            return result
         except TimeoutError:
             self.logger.error("Plugin %s.%s timed out", plugin.key, method)
-            self.state.record_failure(plugin.key)
+            self.metrics.timeout(plugin.key, method)
+            self._violation(plugin.key, method, "timeout", budget.timeout_ms, budget.timeout_ms)
         except Exception as e:
             self.logger.error("Plugin %s.%s failed: %s", plugin.key, method, e)
-            self.state.record_failure(plugin.key)
+            self.metrics.error(plugin.key, method)
+        self._record_failure(plugin.key, ck, method)
         return None
 
+    def _with_deadline(self, args: tuple, deadline: float) -> tuple:
+        # Each call sees its own ctx copy with "hook_deadline", the
+        # time.monotonic() at which the dispatcher stops waiting for it
+        if args and isinstance(args[-1], dict):
+            return args[:-1] + (dict(args[-1], hook_deadline=deadline),)
+        return args
+
+    def _timed(self, plugin: LoadedPlugin, slots: threading.BoundedSemaphore, method: str, fn: Callable,
+               *args, **kwargs):
+        # Runs on the pool thread so latency excludes queueing; a call that
+        # outlives its timeout is still observed when it finally returns.
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            slots.release()
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            self.metrics.observe(plugin.key, method, elapsed_ms)
+            budget = self._budget(plugin)
+            if budget.latency_ms < elapsed_ms <= budget.timeout_ms:
+                self._violation(plugin.key, method, "latency", elapsed_ms, budget.latency_ms)
+            self.metrics.maybe_flush()
+
+    def _admit(self, plugin: LoadedPlugin, ck: str, method: str,
+               timeout: float) -> Optional[threading.BoundedSemaphore]:
+        # Take a concurrency slot, then ask the breaker; the slot is taken
+        # first so a claimed half-open probe is always actually called.
+        slots = self._acquire(plugin, method, timeout)
+        if slots is not None and not self.state.allow(ck, method):
+            slots.release()
+            return None
+        return slots
+
+    def _record_failure(self, key: str, ck: str, method: str) -> None:
+        trips = self.state.circuit(ck, method).trips
+        self.state.record_failure(ck, method)
+        if self.state.circuit(ck, method).trips > trips:
+            self.metrics.trip(key)
+
+    def _call_all(self, method: str, *args) -> List[Any]:
+        # Fan a decision hook out to every plugin at once under one deadline;
+        # results come back in plugin order so merges stay deterministic.
+        # Slots are taken without waiting: a plugin whose slots are all held
+        # (e.g. by calls still hung past their timeout) is skipped for this
+        # round rather than eating the deadline of the plugins after it.
+        pending = []
+        started = time.monotonic()
+        ck = {plugin.key: self._circuit(plugin, args) for plugin in self.plugins}
+        for plugin in self.plugins:
+            if self.state.is_open(ck[plugin.key], method):
+                continue
+            fn = getattr(plugin.instance, method, None)
+            if callable(fn):
+                deadline = started + self._budget(plugin).timeout_ms / 1000.0
+                slots = self._admit(plugin, ck[plugin.key], method, 0.0)
+                if slots is not None:
+                    fut = self.pool.submit(self._timed, plugin, slots, method, fn,
+                                           *self._with_deadline(args, deadline))
+                    pending.append((plugin, slots, deadline, fut))
+        results = []
+        for plugin, slots, deadline, fut in pending:
+            try:
+                results.append(fut.result(timeout=max(0.0, deadline - time.monotonic())))
+                self.state.record_success(ck[plugin.key], method)
+                continue
+            except TimeoutError:
+                if fut.cancel():
+                    slots.release()
+                self.logger.error("Plugin %s.%s timed out", plugin.key, method)
+                self.metrics.timeout(plugin.key, method)
+                self._violation(plugin.key, method, "timeout", self._budget(plugin).timeout_ms,
+                                self._budget(plugin).timeout_ms)
+            except Exception as e:
+                self.logger.error("Plugin %s.%s failed: %s", plugin.key, method, e)
+                self.metrics.error(plugin.key, method)
+            self._record_failure(plugin.key, ck[plugin.key], method)
+            results.append(None)
+        return results
+
+    def _implements(self, plugin: LoadedPlugin, method: str) -> bool:
+        # False when the hook is missing or only BasePlugin's no-op default,
+        # so notifications are not queued just to do nothing
+        if not callable(getattr(plugin.instance, method, None)):
+            return False
+        cls = plugin.instance._cls if isinstance(plugin.instance, ProcessPlugin) else type(plugin.instance)
+        return getattr(cls, method, None) is not getattr(BasePlugin, method, None)
+
+    def _notify(self, method: str, *args) -> None:
+        # Notification hooks return nothing, so queue them per plugin and
+        # let the pipeline move on; slow plugins only fall behind themselves.
+        for plugin in self.plugins:
+            if not self._implements(plugin, method):
+                continue
+            if self.state.is_open(self._circuit(plugin, args), method):
+                continue
+            self._queue(plugin).put(method, args)
+
+    def _queue(self, plugin: LoadedPlugin) -> NotificationQueue:
+        with self._queues_lock:
+            q = self._queues.get(plugin.key)
+            if q is None:
+                q = NotificationQueue(
+                    lambda m, a, p=plugin: self._deliver(p, m, a),
+                    self.notify_queue_size,
+                    name=f"fwgp-notify-{plugin.key}",
+                    logger=self.logger,
+                )
+                self._queues[plugin.key] = q
+            return q
+
+    def _deliver(self, plugin: LoadedPlugin, method: str, args: tuple) -> None:
+        # Runs on the plugin's queue thread. A call that timed out may still
+        # be running: give it this call's timeout to finish, and if it does
+        # not, count this notification as timed out too instead of taking a
+        # second thread. A hung plugin holds one thread until its circuit opens.
+        prev = self._inflight.get(plugin.key)
+        if prev is not None and not prev.done():
+            budget = self._budget(plugin)
+            wait_futures([prev], timeout=budget.timeout_ms / 1000.0)
+            if not prev.done():
+                ck = self._circuit(plugin, args)
+                if self.state.is_open(ck, method):
+                    return
+                self.logger.error("Plugin %s.%s timed out", plugin.key, method)
+                self.metrics.timeout(plugin.key, method)
+                self._violation(plugin.key, method, "timeout", budget.timeout_ms, budget.timeout_ms)
+                self._record_failure(plugin.key, ck, method)
+                return
+        self._call(plugin, method, *args, notification=True)
+
+    def notification_stats(self) -> Dict[str, Dict[str, int]]:
+        with self._queues_lock:
+            return {key: {"depth": q.depth, "dropped": q.dropped} for key, q in self._queues.items()}
+
+    def drain_notifications(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued notification has been delivered."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queues_lock:
+            queues = list(self._queues.values())
+        for q in queues:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not q.drain(remaining):
+                return False
+        return True
+
     # Hook invocations
     def on_file_detected(self, evt: events.FileDetectedEvent, ctx: Dict[str, Any]):
-        for p in self.plugins:
-            self._call(p, events.Hook.ON_FILE_DETECTED.value, evt, ctx)
+        self._notify(events.Hook.ON_FILE_DETECTED.value, evt, ctx)
+
+    def on_files_detected(self, evts: List[events.FileDetectedEvent], ctx: Dict[str, Any]):
+        # One batch call per plugin; per-event fallback for plugins that only
+        # implement onFileDetected.
+        if not evts:
+            return
+        for plugin in self.plugins:
+            ck = self._circuit(plugin, (ctx,))
+            if self._implements(plugin, events.Hook.ON_FILES_DETECTED.value):
+                if self.state.is_open(ck, events.Hook.ON_FILES_DETECTED.value):
+                    continue
+                self._queue(plugin).put(events.Hook.ON_FILES_DETECTED.value, (list(evts), ctx))
+            elif self._implements(plugin, events.Hook.ON_FILE_DETECTED.value):
+                if self.state.is_open(ck, events.Hook.ON_FILE_DETECTED.value):
+                    continue
+                q = self._queue(plugin)
+                for evt in evts:
+                    q.put(events.Hook.ON_FILE_DETECTED.value, (evt, ctx))
 
     def before_stage(self, req: events.StageRequest, ctx: Dict[str, Any]) -> Tuple[bool, List[str]]:
         allow = True
         reasons: List[str] = []
-        for p in self.plugins:
-            res = self._call(p, events.Hook.BEFORE_STAGE.value, req, ctx)
+        for res in self._call_all(events.Hook.BEFORE_STAGE.value, req, ctx):
             if hasattr(res, "allow") and res and res.allow is False:
                 allow = False
                 if getattr(res, "reasons", None):
@@ -70,15 +429,13 @@ class Dispatcher:
         return allow, reasons
 
     def after_stage(self, req: events.StageRequest, ctx: Dict[str, Any]):
-        for p in self.plugins:
-            self._call(p, events.Hook.AFTER_STAGE.value, req, ctx)
+        self._notify(events.Hook.AFTER_STAGE.value, req, ctx)
 
     def before_commit(self, req: events.CommitRequest, ctx: Dict[str, Any]):
         allow = True
         message_override = None
         sign = False
-        for p in self.plugins:
-            res = self._call(p, events.Hook.BEFORE_COMMIT.value, req, ctx)
+        for res in self._call_all(events.Hook.BEFORE_COMMIT.value, req, ctx):
             if hasattr(res, "allow") and res and res.allow is False:
                 allow = False
             if hasattr(res, "message_override") and res and res.message_override:
@@ -88,14 +445,12 @@ class Dispatcher:
         return allow, message_override, sign
 
     def after_commit(self, commit_sha: Optional[str], ctx: Dict[str, Any]):
-        for p in self.plugins:
-            self._call(p, events.Hook.AFTER_COMMIT.value, commit_sha, ctx)
+        self._notify(events.Hook.AFTER_COMMIT.value, commit_sha, ctx)
 
     def before_push(self, req: events.PushRequest, ctx: Dict[str, Any]):
         allow = True
         force = False
-        for p in self.plugins:
-            res = self._call(p, events.Hook.BEFORE_PUSH.value, req, ctx)
+        for res in self._call_all(events.Hook.BEFORE_PUSH.value, req, ctx):
             if hasattr(res, "allow") and res and res.allow is False:
                 allow = False
             if hasattr(res, "force") and res and res.force:
@@ -103,14 +458,12 @@ class Dispatcher:
         return allow, force
 
     def after_push(self, req: events.PushRequest, ctx: Dict[str, Any]):
-        for p in self.plugins:
-            self._call(p, events.Hook.AFTER_PUSH.value, req, ctx)
+        self._notify(events.Hook.AFTER_PUSH.value, req, ctx)
 
     def before_pull(self, req: events.PullRequest, ctx: Dict[str, Any]):
         allow = True
         strategy = None
-        for p in self.plugins:
-            res = self._call(p, events.Hook.BEFORE_PULL.value, req, ctx)
+        for res in self._call_all(events.Hook.BEFORE_PULL.value, req, ctx):
             if hasattr(res, "allow") and res and res.allow is False:
                 allow = False
             if hasattr(res, "strategy") and res and res.strategy:
@@ -118,8 +471,7 @@ class Dispatcher:
         return allow, strategy
 
     def after_pull(self, res: events.PullResult, ctx: Dict[str, Any]):
-        for p in self.plugins:
-            self._call(p, events.Hook.AFTER_PULL.value, res, ctx)
+        self._notify(events.Hook.AFTER_PULL.value, res, ctx)
 
     def on_conflict(self, info: events.ConflictInfo, ctx: Dict[str, Any]):
         for p in self.plugins:
@@ -13,6 +13,7 @@ class ChangeType(str, Enum):
 
 class Hook(str, Enum):
     ON_FILE_DETECTED = "onFileDetected"
+    ON_FILES_DETECTED = "onFilesDetected"
     BEFORE_STAGE = "beforeStage"
     AFTER_STAGE = "afterStage"
     BEFORE_COMMIT = "beforeCommit"
@@ -22,6 +23,7 @@ class Hook(str, Enum):
     BEFORE_PULL = "beforePull"
     AFTER_PULL = "afterPull"
     ON_CONFLICT = "onConflict"
+    ON_BUDGET_VIOLATION = "onBudgetViolation"
 
 
 @dataclass
@@ -51,6 +53,7 @@ class CommitRequest:
     staged_summary: List[str]
     repo: str
     author: Optional[str] = None
+    events: Optional[List[FileDetectedEvent]] = None  # the batch being committed
 
 
 @dataclass
@@ -97,3 +100,12 @@ class ConflictInfo:
 class PullResult:
     updated: bool
     conflicts: Optional[List[str]] = None
+
+
+@dataclass
+class BudgetViolation:
+    plugin: str
+    hook: str
+    kind: str  # "latency" | "timeout" | "memory" | "concurrency"
+    value: float
+    limit: float
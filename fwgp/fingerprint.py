@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from fwgp.fsutil import atomic_write_text
+
+
+def hash_file(path: str, chunk_size: int = 1 << 20) -> Optional[str]:
+    h = hashlib.blake2b(digest_size=20)
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    try:
+        with open(path, "rb", buffering=0) as fh:
+            while True:
+                n = fh.readinto(buf)
+                if not n:
+                    break
+                h.update(view[:n])
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+class FingerprintIndex:
+    """Persistent ``path -> (size, mtime_ns, digest)`` index.
+
+    ``changed`` answers whether a file's content differs from the last
+    recorded fingerprint. Size and mtime are compared first; the file is only
+    hashed when they differ. Files are fingerprinted lazily, the first time
+    the watcher reports them, so an initial run never hashes the whole tree.
+    """
+
+    def __init__(self, base_dir: str, flush_interval_sec: float = 30.0):
+        self.path = Path(base_dir) / "data" / "fingerprints.json"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval_sec = flush_interval_sec
+        self.entries: Dict[str, List] = {}
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+            self.entries = {k: list(v) for k, v in raw.get("files", {}).items()}
+        except Exception:
+            # start fresh on corrupt index
+            self.entries = {}
+
+    def changed(self, path: str) -> bool:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return True
+        with self._lock:
+            old = self.entries.get(path)
+        if old is not None and old[0] == st.st_size and old[1] == st.st_mtime_ns:
+            return False
+        digest = hash_file(path)
+        if digest is None:
+            return True
+        with self._lock:
+            self.entries[path] = [st.st_size, st.st_mtime_ns, digest]
+            self._dirty = True
+        return old is None or old[2] != digest
+
+    def forget(self, path: str) -> None:
+        with self._lock:
+            if self.entries.pop(path, None) is not None:
+                self._dirty = True
+
+    def maybe_flush(self) -> None:
+        if self._dirty and time.monotonic() - self._last_flush >= self.flush_interval_sec:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps({"files": self.entries}, separators=(",", ":"))
+            self._dirty = False
+        atomic_write_text(self.path, payload)
+        self._last_flush = time.monotonic()
@@ -1,18 +1,22 @@
 from __future__ import annotations
 
 import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 
 class GitError(RuntimeError):
     pass
 
 
-def _run_git(repo_path: str, args: List[str], timeout: float = 15.0) -> Tuple[int, str, str]:
+def _run_git(repo_path: str, args: List[str], timeout: float = 15.0, input: Optional[str] = None) -> Tuple[int, str, str]:
     proc = subprocess.run(
         ["git", *args],
         cwd=repo_path,
+        input=input,
         capture_output=True,
         text=True,
         timeout=timeout,
@@ -21,6 +25,197 @@ def _run_git(repo_path: str, args: List[str], timeout: float = 15.0) -> Tuple[in
     return proc.returncode, proc.stdout.strip(), proc.stderr.strip()
 
 
+class GitWorker:
+    """Long-lived ``git cat-file`` processes for object and ref lookups.
+
+    ``resolve``/``object_info`` stream requests to ``cat-file --batch-check``
+    and ``read_object`` to ``cat-file --batch``, each spawned on first use
+    and respawned if it dies. A request that gets no answer within
+    ``timeout_sec`` kills its process. Porcelain operations stay one-shot.
+    """
+
+    def __init__(self, repo_path: str, timeout_sec: float = 15.0):
+        self.repo_path = repo_path
+        self.timeout_sec = timeout_sec
+        self._procs: Dict[str, subprocess.Popen] = {}
+        self._lock = threading.Lock()
+
+    def _proc(self, mode: str) -> subprocess.Popen:
+        proc = self._procs.get(mode)
+        if proc is not None and proc.poll() is not None:
+            self._kill(mode)
+            proc = None
+        if proc is None:
+            proc = subprocess.Popen(
+                ["git", "cat-file", mode],
+                cwd=self.repo_path,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                shell=False,
+            )
+            self._procs[mode] = proc
+        return proc
+
+    def _request(self, mode: str, ref: str) -> Tuple[Optional[Tuple[str, str, int]], Optional[bytes]]:
+        if "\n" in ref:
+            raise ValueError("ref must not contain a newline")
+        with self._lock:
+            for attempt in (0, 1):
+                proc = self._proc(mode)
+                # A hung cat-file is killed, which ends the blocked read
+                watchdog = threading.Timer(self.timeout_sec, proc.kill)
+                watchdog.daemon = True
+                watchdog.start()
+                try:
+                    proc.stdin.write(ref.encode("utf-8") + b"\n")
+                    proc.stdin.flush()
+                    header = proc.stdout.readline()
+                    if not header:
+                        raise BrokenPipeError("git cat-file exited")
+                    parts = header.decode("utf-8", "replace").split()
+                    if len(parts) != 3 or parts[-1] in ("missing", "ambiguous"):
+                        return None, None
+                    sha, otype, size = parts[0], parts[1], int(parts[2])
+                    data = None
+                    if mode == "--batch":
+                        data = proc.stdout.read(size)
+                        if len(data) != size or proc.stdout.read(1) != b"\n":
+                            raise BrokenPipeError("git cat-file output truncated")
+                    return (sha, otype, size), data
+                except (BrokenPipeError, OSError, ValueError):
+                    self._kill(mode)
+                    if attempt:
+                        raise GitError(f"git cat-file {mode} failed for {ref}")
+                finally:
+                    watchdog.cancel()
+        return None, None
+
+    def _kill(self, mode: str) -> None:
+        proc = self._procs.pop(mode, None)
+        if proc is None:
+            return
+        try:
+            if proc.poll() is None:
+                proc.kill()
+            proc.wait(timeout=5)
+        except Exception:
+            pass
+        for pipe in (proc.stdin, proc.stdout):
+            try:
+                pipe.close()
+            except Exception:
+                pass
+
+    def object_info(self, ref: str) -> Optional[Tuple[str, str, int]]:
+        return self._request("--batch-check", ref)[0]
+
+    def resolve(self, ref: str) -> Optional[str]:
+        info = self.object_info(ref)
+        return info[0] if info else None
+
+    def read_object(self, ref: str) -> Optional[bytes]:
+        return self._request("--batch", ref)[1]
+
+    def close(self) -> None:
+        with self._lock:
+            for mode in list(self._procs):
+                proc = self._procs[mode]
+                try:
+                    proc.stdin.close()
+                    proc.wait(timeout=5)
+                except Exception:
+                    pass
+                self._kill(mode)
+
+
+@dataclass
+class StatusSnapshot:
+    """One ``git status --porcelain=v2`` reading of HEAD, index and worktree."""
+
+    head: Optional[str] = None
+    branch: Optional[str] = None
+    staged: List[str] = field(default_factory=list)
+    unstaged: List[str] = field(default_factory=list)
+    untracked: List[str] = field(default_factory=list)
+    unmerged: List[str] = field(default_factory=list)
+
+
+# Read-only: status must not take index.lock, since the remote sync phase runs
+# it outside the git lock while the commit phase may be adding
+STATUS_ARGS = ["--no-optional-locks", "status", "--porcelain=v2", "-z", "--branch"]
+
+
+def status(repo_path: str) -> StatusSnapshot:
+    code, out, err = _run_git(repo_path, STATUS_ARGS)
+    if code != 0:
+        raise GitError(err or out)
+    return parse_status(out)
+
+
+def parse_status(out: str) -> StatusSnapshot:
+    snap = StatusSnapshot()
+    records = out.split("\0")
+    i = 0
+    while i < len(records):
+        rec = records[i]
+        i += 1
+        if rec.startswith("# branch.oid "):
+            oid = rec[len("# branch.oid "):]
+            snap.head = None if oid == "(initial)" else oid
+        elif rec.startswith("# branch.head "):
+            head = rec[len("# branch.head "):]
+            snap.branch = None if head == "(detached)" else head
+        elif rec.startswith(("1 ", "2 ")):
+            fields = rec.split(" ", 8 if rec[0] == "1" else 9)
+            xy, path = fields[1], fields[-1]
+            if rec[0] == "2":
+                i += 1  # rename/copy source follows as its own record
+            if xy[0] != ".":
+                snap.staged.append(path)
+            if xy[1] != ".":
+                snap.unstaged.append(path)
+        elif rec.startswith("u "):
+            snap.unmerged.append(rec.split(" ", 10)[-1])
+        elif rec.startswith("? "):
+            snap.untracked.append(rec[2:])
+    return snap
+
+
+class StatusCache:
+    """Reuses one ``status`` snapshot until the index file changes.
+
+    Worktree-only edits do not touch the index, so callers ``invalidate``
+    when the watcher reports changes to pick up ``unstaged``/``untracked``.
+    """
+
+    def __init__(self, repo_path: str):
+        self.repo_path = repo_path
+        self._snapshot: Optional[StatusSnapshot] = None
+        self._key: Optional[Tuple[int, int, int]] = None
+        self._lock = threading.Lock()
+
+    def _index_key(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = Path(self.repo_path, ".git", "index").stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def get(self) -> StatusSnapshot:
+        with self._lock:
+            key = self._index_key()
+            if self._snapshot is None or key is None or key != self._key:
+                self._snapshot = status(self.repo_path)
+                # status may refresh the index itself; key on what it left
+                self._key = self._index_key()
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshot = None
+
+
 def is_repo(repo_path: str) -> bool:
     return Path(repo_path, ".git").exists()
 
@@ -47,6 +242,19 @@ def get_branch(repo_path: str) -> str:
     return out
 
 
+def rev_parse(repo_path: str, ref: str, worker: Optional[GitWorker] = None) -> Optional[str]:
+    if worker is not None:
+        return worker.resolve(f"{ref}^{{commit}}")
+    code, out, err = _run_git(repo_path, ["rev-parse", "--verify", "-q", f"{ref}^{{commit}}"])
+    if code != 0:
+        return None
+    return out
+
+
+def head_sha(repo_path: str, worker: Optional[GitWorker] = None) -> Optional[str]:
+    return rev_parse(repo_path, "HEAD", worker=worker)
+
+
 def checkout_branch(repo_path: str, branch: str, create: bool = False) -> None:
     args = ["checkout"] + (["-b", branch] if create else [branch])
     code, out, err = _run_git(repo_path, args)
@@ -54,12 +262,40 @@ def checkout_branch(repo_path: str, branch: str, create: bool = False) -> None:
         raise GitError(err or out)
 
 
-def add(repo_path: str, paths: List[str]) -> None:
-    if not paths:
-        return
-    code, out, err = _run_git(repo_path, ["add", "--", *paths])
+ADD_ARGS = ["add", "--pathspec-from-file=-", "--pathspec-file-nul"]
+
+
+def add_chunks(paths: List[str], chunk_size: int) -> List[List[str]]:
+    step = max(1, chunk_size)
+    return [paths[i:i + step] for i in range(0, len(paths), step)]
+
+
+def add(repo_path: str, paths: List[str], chunk_size: int = 10000) -> List[Tuple[int, float]]:
+    """Stage ``paths`` and return ``(path_count, seconds)`` per chunk.
+
+    Paths are streamed NUL-separated on stdin via ``--pathspec-from-file``
+    rather than argv, so the list size is bounded only by ``chunk_size``.
+    """
+    timings: List[Tuple[int, float]] = []
+    for chunk in add_chunks(paths, chunk_size):
+        started = time.monotonic()
+        code, out, err = _run_git(repo_path, ADD_ARGS, timeout=max(15.0, len(chunk) / 500.0),
+                                  input="\0".join(chunk) + "\0")
+        if code != 0:
+            raise GitError(err or out)
+        timings.append((len(chunk), time.monotonic() - started))
+    return timings
+
+
+def ignored_tracked(repo_path: str) -> List[str]:
+    """Tracked paths that the ignore rules would otherwise exclude."""
+    # Explicit --git-dir so a directory without a repository never falls
+    # back to an enclosing one
+    code, out, err = _run_git(repo_path, ["--git-dir", str(Path(repo_path, ".git")), "--work-tree", repo_path,
+                                          "ls-files", "-z", "--cached", "--ignored", "--exclude-standard"])
     if code != 0:
         raise GitError(err or out)
+    return [p for p in out.split("\0") if p]
 
 
 def staged_summary(repo_path: str) -> List[str]:
@@ -69,7 +305,52 @@ def staged_summary(repo_path: str) -> List[str]:
     return [line for line in out.splitlines() if line.strip()]
 
 
-def commit(repo_path: str, message: str, sign: bool = False) -> Optional[str]:
+@dataclass
+class StagedBlob:
+    """A staged file's index blob and, for modifications, its HEAD blob."""
+
+    path: str
+    new_sha: str
+    old_sha: Optional[str] = None  # None when the file is new
+
+
+STAGED_BLOBS_ARGS = ["diff", "--cached", "--raw", "-z", "--no-abbrev", "--no-renames", "--diff-filter=AM"]
+NULL_SHA = "0" * 40
+
+
+def staged_blobs(repo_path: str) -> Dict[str, StagedBlob]:
+    code, out, err = _run_git(repo_path, STAGED_BLOBS_ARGS)
+    if code != 0:
+        raise GitError(err or out)
+    return parse_raw_diff(out)
+
+
+def parse_raw_diff(out: str) -> Dict[str, StagedBlob]:
+    # -z raw records: ":<old mode> <new mode> <old sha> <new sha> <status>\0<path>\0"
+    blobs: Dict[str, StagedBlob] = {}
+    fields = out.split("\0")
+    for meta, path in zip(fields[0::2], fields[1::2]):
+        parts = meta.lstrip(":").split()
+        if len(parts) != 5 or parts[1] == "160000":  # skip gitlinks
+            continue
+        old_sha = None if parts[2].strip("0") == "" else parts[2]
+        blobs[path] = StagedBlob(path=path, new_sha=parts[3], old_sha=old_sha)
+    return blobs
+
+
+def open_blob(repo_path: str, sha: str) -> subprocess.Popen:
+    # Streams the blob on stdout (bytes); the caller closes and reaps it
+    return subprocess.Popen(["git", "cat-file", "blob", sha], cwd=repo_path, stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL, shell=False)
+
+
+def open_blob_diff(repo_path: str, old_sha: str, new_sha: str) -> subprocess.Popen:
+    # Zero-context diff between two blobs, streamed on stdout (bytes)
+    return subprocess.Popen(["git", "diff", "-U0", "--no-color", "--no-ext-diff", old_sha, new_sha],
+                            cwd=repo_path, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, shell=False)
+
+
+def commit(repo_path: str, message: str, sign: bool = False, worker: Optional[GitWorker] = None) -> Optional[str]:
     args = ["commit", "-m", message]
     if sign:
         args.append("-S")
@@ -80,6 +361,8 @@ def commit(repo_path: str, message: str, sign: bool = False) -> Optional[str]:
             return None
         raise GitError(err or out)
     # Return new commit sha
+    if worker is not None:
+        return head_sha(repo_path, worker=worker)
     code, out, err = _run_git(repo_path, ["rev-parse", "HEAD"])
     if code != 0:
         return None
@@ -102,6 +385,19 @@ def pull(repo_path: str, remote: str, branch: str) -> None:
         raise GitError(err or out)
 
 
+def fetch(repo_path: str, remote: str, branch: str) -> None:
+    code, out, err = _run_git(repo_path, ["fetch", remote, branch], timeout=120.0)
+    if code != 0:
+        raise GitError(err or out)
+
+
+def merge(repo_path: str, ref: str, ff_only: bool = False) -> None:
+    args = ["merge", "--ff-only" if ff_only else "--no-edit", ref]
+    code, out, err = _run_git(repo_path, args, timeout=120.0)
+    if code != 0:
+        raise GitError(err or out)
+
+
 def list_conflicts(repo_path: str) -> List[str]:
     # Use diff-filter=U to list unmerged files
     code, out, err = _run_git(repo_path, ["diff", "--name-only", "--diff-filter=U"])
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import List, Optional, Tuple
+
+from fwgp.git_adapter import ADD_ARGS, STATUS_ARGS, GitError, StatusSnapshot, add_chunks, parse_status
+
+
+class AsyncGit:
+    """``asyncio`` counterpart of ``git_adapter`` for many repos per process.
+
+    Every call goes through ``asyncio.create_subprocess_exec``; at most
+    ``max_concurrency`` git processes run at once across all repos sharing
+    this instance.
+    """
+
+    def __init__(self, max_concurrency: int = 8):
+        self.max_concurrency = max_concurrency
+        self._sem: Optional[asyncio.Semaphore] = None
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so the instance can be built outside the event loop
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.max_concurrency)
+        return self._sem
+
+    async def run(self, repo_path: str, args: List[str], timeout: float = 15.0,
+                  input: Optional[str] = None) -> Tuple[int, str, str]:
+        async with self._semaphore():
+            proc = await asyncio.create_subprocess_exec(
+                "git", *args,
+                cwd=repo_path,
+                stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            try:
+                out, err = await asyncio.wait_for(
+                    proc.communicate(input.encode("utf-8") if input is not None else None), timeout
+                )
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                command = next((a for a in args if not a.startswith("-")), args[0])
+                raise GitError(f"git {command} timed out after {timeout}s")
+        return proc.returncode, out.decode("utf-8", "replace").strip(), err.decode("utf-8", "replace").strip()
+
+    async def rev_parse(self, repo_path: str, ref: str) -> Optional[str]:
+        code, out, err = await self.run(repo_path, ["rev-parse", "--verify", "-q", f"{ref}^{{commit}}"])
+        if code != 0:
+            return None
+        return out
+
+    async def head_sha(self, repo_path: str) -> Optional[str]:
+        return await self.rev_parse(repo_path, "HEAD")
+
+    async def status(self, repo_path: str) -> StatusSnapshot:
+        code, out, err = await self.run(repo_path, STATUS_ARGS)
+        if code != 0:
+            raise GitError(err or out)
+        return parse_status(out)
+
+    async def add(self, repo_path: str, paths: List[str], chunk_size: int = 10000) -> List[Tuple[int, float]]:
+        timings: List[Tuple[int, float]] = []
+        for chunk in add_chunks(paths, chunk_size):
+            started = time.monotonic()
+            code, out, err = await self.run(repo_path, ADD_ARGS, timeout=max(15.0, len(chunk) / 500.0),
+                                            input="\0".join(chunk) + "\0")
+            if code != 0:
+                raise GitError(err or out)
+            timings.append((len(chunk), time.monotonic() - started))
+        return timings
+
+    async def commit(self, repo_path: str, message: str, sign: bool = False) -> Optional[str]:
+        args = ["commit", "-m", message]
+        if sign:
+            args.append("-S")
+        code, out, err = await self.run(repo_path, args)
+        if code != 0:
+            # No changes to commit is not fatal
+            if "nothing to commit" in (out + err).lower():
+                return None
+            raise GitError(err or out)
+        return await self.head_sha(repo_path)
+
+    async def push(self, repo_path: str, remote: str, branch: str, force: bool = False) -> None:
+        args = ["push", remote, branch]
+        if force:
+            args.insert(1, "--force-with-lease")
+        code, out, err = await self.run(repo_path, args, timeout=60.0)
+        if code != 0:
+            raise GitError(err or out)
+
+    async def fetch(self, repo_path: str, remote: str, branch: str) -> None:
+        code, out, err = await self.run(repo_path, ["fetch", remote, branch], timeout=120.0)
+        if code != 0:
+            raise GitError(err or out)
+
+    async def merge(self, repo_path: str, ref: str, ff_only: bool = False) -> None:
+        args = ["merge", "--ff-only" if ff_only else "--no-edit", ref]
+        code, out, err = await self.run(repo_path, args, timeout=120.0)
+        if code != 0:
+            raise GitError(err or out)
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass
+from typing import FrozenSet, List, Optional, Pattern, Tuple
+
+from fwgp.git_adapter import GitError, ignored_tracked
+
+
+@dataclass
+class IgnoreRule:
+    regex: Pattern[str]
+    negate: bool
+    dir_only: bool
+    anchored: bool
+
+
+def _glob_to_regex(pat: str) -> str:
+    out: List[str] = []
+    i, n = 0, len(pat)
+    while i < n:
+        c = pat[i]
+        if c == "*":
+            if pat.startswith("**", i):
+                at_start = i == 0 or pat[i - 1] == "/"
+                at_end = i + 2 == n
+                if at_start and at_end:
+                    out.append(".*")
+                    i += 2
+                    continue
+                if at_start and pat.startswith("**/", i):
+                    out.append("(?:.*/)?")
+                    i += 3
+                    continue
+            out.append("[^/]*")
+            while i < n and pat[i] == "*":
+                i += 1
+            continue
+        if c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = pat.find("]", i + 2 if pat.startswith("[!", i) or pat.startswith("[^", i) else i + 1)
+            if j == -1:
+                out.append(re.escape(c))
+            else:
+                body = pat[i + 1:j]
+                if body[:1] in ("!", "^"):
+                    body = "^" + body[1:]
+                out.append("[" + body.replace("\\", "\\\\") + "]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pat[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def parse_rule(line: str) -> Optional[IgnoreRule]:
+    line = line.rstrip("\n\r")
+    # Trailing spaces are ignored unless escaped
+    while line.endswith(" ") and not line.endswith("\\ "):
+        line = line[:-1]
+    if not line or line.startswith("#"):
+        return None
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    elif line.startswith("\\!") or line.startswith("\\#"):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    anchored = "/" in line
+    line = line.lstrip("/")
+    return IgnoreRule(re.compile(_glob_to_regex(line) + r"\Z"), negate, dir_only, anchored)
+
+
+class IgnoreRules:
+    """Compiled ``.gitignore`` / ``.git/info/exclude`` rules for a repo root.
+
+    Only the root ``.gitignore`` is read. As in git, ignore rules do not
+    apply to tracked files: those (and the directories holding them) are
+    never reported as ignored. ``refresh`` recompiles the rules when either
+    source file changed, re-reads the tracked-but-ignored paths when the
+    index changed, and reports whether the outcome can differ.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self.sources = [
+            os.path.join(self.root, ".gitignore"),
+            os.path.join(self.root, ".git", "info", "exclude"),
+        ]
+        self.index_path = os.path.join(self.root, ".git", "index")
+        self.rules: List[IgnoreRule] = []
+        # Tracked files the rules match, and the ignored directories that
+        # must still be walked to reach them
+        self.tracked: FrozenSet[str] = frozenset()
+        self.tracked_dirs: FrozenSet[str] = frozenset()
+        self._stamp: Optional[Tuple] = None
+        self._index_stamp: Optional[Tuple] = None
+        self.refresh()
+
+    def _source_stamp(self, sources: List[str]) -> Tuple:
+        stamp = []
+        for src in sources:
+            try:
+                st = os.stat(src)
+                stamp.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def refresh(self) -> bool:
+        stamp = self._source_stamp(self.sources)
+        index_stamp = self._source_stamp([self.index_path])
+        if stamp == self._stamp and index_stamp == self._index_stamp:
+            return False
+        changed = stamp != self._stamp
+        if changed:
+            self._load_rules()
+            self._stamp = stamp
+        self._index_stamp = index_stamp
+        return self._load_tracked() or changed
+
+    def _load_rules(self) -> None:
+        rules: List[IgnoreRule] = []
+        for src in self.sources:
+            try:
+                with open(src, "r", encoding="utf-8", errors="ignore") as fh:
+                    for line in fh:
+                        rule = parse_rule(line)
+                        if rule is not None:
+                            rules.append(rule)
+            except OSError:
+                continue
+        self.rules = rules
+
+    def _load_tracked(self) -> bool:
+        try:
+            tracked = frozenset(ignored_tracked(self.root))
+        except (GitError, OSError):
+            tracked = frozenset()
+        dirs = set()
+        for rel in tracked:
+            parts = rel.split("/")
+            for i in range(1, len(parts)):
+                parent = "/".join(parts[:i])
+                if self._match_tree(parent, True):
+                    dirs.add(parent)
+        if tracked == self.tracked and dirs == self.tracked_dirs:
+            return False
+        self.tracked, self.tracked_dirs = tracked, frozenset(dirs)
+        return True
+
+    def match(self, rel: str, is_dir: bool) -> bool:
+        # ``rel`` is a '/'-separated path relative to the root. Last match wins.
+        name = rel.rsplit("/", 1)[-1]
+        ignored = False
+        for rule in self.rules:
+            if rule.dir_only and not is_dir:
+                continue
+            if ignored == (not rule.negate):
+                continue
+            target = rel if rule.anchored else name
+            if rule.regex.match(target):
+                ignored = not rule.negate
+        return ignored
+
+    def relpath(self, path: str) -> Optional[str]:
+        if not path.startswith(self.root + os.sep):
+            path = os.path.abspath(path)
+        if not path.startswith(self.root + os.sep):
+            return None
+        rel = path[len(self.root) + 1:]
+        return rel.replace(os.sep, "/") if os.sep != "/" else rel
+
+    def _match_tree(self, rel: str, is_dir: bool) -> bool:
+        parts = rel.split("/")
+        for i in range(1, len(parts)):
+            if self.match("/".join(parts[:i]), True):
+                return True
+        return self.match(rel, is_dir)
+
+    def _is_tracked(self, rel: str, is_dir: bool) -> bool:
+        return rel in (self.tracked_dirs if is_dir else self.tracked)
+
+    def is_ignored(self, path: str, is_dir: bool = False) -> bool:
+        # For walkers that prune ignored directories; only a directory kept
+        # for its tracked files needs its untracked entries checked here.
+        rel = self.relpath(path)
+        if rel is None or self._is_tracked(rel, is_dir):
+            return False
+        parent = rel.rpartition("/")[0]
+        if parent and parent in self.tracked_dirs:
+            return True
+        return self.match(rel, is_dir)
+
+    def is_ignored_tree(self, path: str, is_dir: bool = False) -> bool:
+        # Also ignored when any ancestor directory is (for event-based watchers
+        # that never walked the parents).
+        rel = self.relpath(path)
+        if rel is None or self._is_tracked(rel, is_dir):
+            return False
+        return self._match_tree(rel, is_dir)
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import importlib
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import TimeoutError
+from functools import partial
+from typing import Any, Callable, List, Optional
+
+from fwgp import events
+
+
+# A new worker gets this long to import and instantiate its plugin; hook
+# timeouts start once it has reported ready.
+STARTUP_TIMEOUT_SEC = 30.0
+
+
+class PluginProcessError(RuntimeError):
+    pass
+
+
+def default_mp_context() -> str:
+    # fork would copy a parent that already runs dispatcher and watcher
+    # threads (and their locks); forkserver/spawn children start clean.
+    return "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def _load_class(spec: str):
+    module_name, class_name = spec.split(":", 1)
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _rss_mb() -> Optional[float]:
+    # Current resident set size; ru_maxrss is a lifetime peak, so one large
+    # call would flag every later one.
+    try:
+        with open("/proc/self/statm", "rb") as fh:
+            resident = int(fh.read().split()[1])
+        return resident * os.sysconf("SC_PAGE_SIZE") / (1024.0 * 1024.0)
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, KiB elsewhere
+    return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+
+
+def _serve(spec: str, conn) -> None:
+    # Child process: instantiate the plugin once, then answer hook calls
+    inst = _load_class(spec)()
+    conn.send(None)  # ready
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            return
+        if msg is None:
+            close = getattr(inst, "close", None)
+            if callable(close):
+                close()
+            return
+        method, args = msg
+        try:
+            conn.send((True, getattr(inst, method)(*args), _rss_mb()))
+        except Exception as e:
+            conn.send((False, f"{type(e).__name__}: {e}", _rss_mb()))
+
+
+class _Worker:
+    def __init__(self, spec: str, ctx):
+        self.spec = spec
+        self.ctx = ctx
+        self.proc = None
+        self.conn = None
+
+    def ensure(self):
+        if self.proc is None or not self.proc.is_alive():
+            self.kill()
+            parent, child = self.ctx.Pipe()
+            self.proc = self.ctx.Process(target=_serve, args=(self.spec, child), daemon=True,
+                                         name=f"fwgp-plugin-{self.spec}")
+            self.proc.start()
+            child.close()
+            self.conn = parent
+            # Wait for the plugin to load so startup is not billed to a hook
+            if not parent.poll(STARTUP_TIMEOUT_SEC):
+                self.kill()
+                raise PluginProcessError(f"{self.spec} worker did not start")
+            parent.recv()
+
+    def kill(self):
+        if self.proc is not None:
+            if self.proc.is_alive():
+                self.proc.kill()
+            self.proc.join(5)
+        if self.conn is not None:
+            self.conn.close()
+        self.proc = None
+        self.conn = None
+
+
+class ProcessPlugin:
+    """Runs a ``module:Class`` plugin in ``workers`` child processes.
+
+    Workers are started up front. Hook methods are proxied: each call is
+    sent to a free worker and waited on for ``timeout_sec``. A worker that
+    overruns is killed and respawned on its next use, so a hung plugin
+    never keeps a dispatcher thread. The same happens to a worker whose RSS
+    after a call exceeds ``max_memory_mb``; ``on_rss(method, rss_mb)`` sees
+    every reading. Workers use ``default_mp_context()`` unless
+    ``mp_context`` names another start method. Arguments and results must
+    be picklable.
+    """
+
+    HOOKS = {h.value for h in events.Hook}
+
+    def __init__(self, spec: str, timeout_sec: float, workers: int = 1, mp_context: Optional[str] = None,
+                 max_memory_mb: Optional[float] = None, on_rss: Optional[Callable[[str, float], None]] = None):
+        self.spec = spec
+        self.timeout_sec = timeout_sec
+        self.max_memory_mb = max_memory_mb
+        self.on_rss = on_rss
+        self._cls = _load_class(spec)
+        ctx = multiprocessing.get_context(mp_context or default_mp_context())
+        self._workers: List[_Worker] = [_Worker(spec, ctx) for _ in range(max(1, workers))]
+        self._free: queue.Queue = queue.Queue()
+        self.restarts = 0
+        self._lock = threading.Lock()
+        try:
+            for w in self._workers:
+                w.ensure()
+                self._free.put(w)
+        except Exception:
+            self.close()
+            raise
+
+    def __getattr__(self, name: str):
+        if name in ProcessPlugin.HOOKS and callable(getattr(self._cls, name, None)):
+            return partial(self.call, name)
+        raise AttributeError(name)
+
+    def call(self, method: str, *args) -> Any:
+        try:
+            worker = self._free.get(timeout=self.timeout_sec)
+        except queue.Empty:
+            raise TimeoutError(f"{self.spec}: no free worker")
+        try:
+            worker.ensure()
+            worker.conn.send((method, args))
+            if not worker.conn.poll(self.timeout_sec):
+                worker.kill()
+                with self._lock:
+                    self.restarts += 1
+                raise TimeoutError(f"{self.spec}.{method} timed out")
+            ok, value, rss_mb = worker.conn.recv()
+            if rss_mb is not None:
+                if self.on_rss is not None:
+                    self.on_rss(method, rss_mb)
+                if self.max_memory_mb is not None and rss_mb > self.max_memory_mb:
+                    worker.kill()
+                    with self._lock:
+                        self.restarts += 1
+        except (EOFError, OSError, BrokenPipeError) as e:
+            worker.kill()
+            raise PluginProcessError(f"{self.spec} worker died: {e}")
+        finally:
+            self._free.put(worker)
+        if not ok:
+            raise PluginProcessError(value)
+        return value
+
+    def close(self):
+        for w in self._workers:
+            if w.conn is not None:
+                try:
+                    w.conn.send(None)
+                    w.proc.join(1)
+                except OSError:
+                    pass
+            w.kill()
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from fwgp.fsutil import atomic_write_text
+
+
+# Upper bounds in milliseconds; +Inf is implicit
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+@dataclass
+class HookStats:
+    calls: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    latency_sum_ms: float = 0.0
+    buckets: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+
+    def quantile_ms(self, q: float) -> Optional[float]:
+        # Bucket upper bound containing the q-th observation (None if empty
+        # or past the last finite bucket)
+        total = sum(self.buckets)
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return float(bound)
+        return None
+
+
+class PluginMetrics:
+    """Per-plugin, per-hook call counts, outcomes and latency histograms.
+
+    ``observe`` records a finished call, ``timeout``/``error`` count failed
+    waits, ``trip`` counts circuit-breaker openings and ``violation`` counts
+    budget violations by kind. ``render`` returns Prometheus text format;
+    ``maybe_flush`` writes it to ``data/metrics.prom`` at most every
+    ``flush_interval_sec``.
+    """
+
+    def __init__(self, base_dir: Optional[str] = None, flush_interval_sec: float = 15.0):
+        self.path = Path(base_dir) / "data" / "metrics.prom" if base_dir else None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval_sec = flush_interval_sec
+        self.hooks: Dict[Tuple[str, str], HookStats] = {}
+        self.trips: Dict[str, int] = {}
+        self.violations: Dict[Tuple[str, str], int] = {}
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _stats(self, plugin: str, hook: str) -> HookStats:
+        st = self.hooks.get((plugin, hook))
+        if st is None:
+            st = self.hooks[(plugin, hook)] = HookStats()
+        return st
+
+    def observe(self, plugin: str, hook: str, latency_ms: float) -> None:
+        with self._lock:
+            st = self._stats(plugin, hook)
+            st.calls += 1
+            st.latency_sum_ms += latency_ms
+            st.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+            self._dirty = True
+
+    def error(self, plugin: str, hook: str) -> None:
+        with self._lock:
+            self._stats(plugin, hook).errors += 1
+            self._dirty = True
+
+    def timeout(self, plugin: str, hook: str) -> None:
+        with self._lock:
+            self._stats(plugin, hook).timeouts += 1
+            self._dirty = True
+
+    def trip(self, plugin: str) -> None:
+        with self._lock:
+            self.trips[plugin] = self.trips.get(plugin, 0) + 1
+            self._dirty = True
+
+    def violation(self, plugin: str, kind: str) -> None:
+        with self._lock:
+            self.violations[(plugin, kind)] = self.violations.get((plugin, kind), 0) + 1
+            self._dirty = True
+
+    def get(self, plugin: str, hook: str) -> HookStats:
+        with self._lock:
+            st = self.hooks.get((plugin, hook)) or HookStats()
+            return HookStats(st.calls, st.errors, st.timeouts, st.latency_sum_ms, list(st.buckets))
+
+    def render(self) -> str:
+        lines = [
+            "# HELP fwgp_plugin_hook_latency_ms Plugin hook latency in milliseconds.",
+            "# TYPE fwgp_plugin_hook_latency_ms histogram",
+        ]
+        with self._lock:
+            items = sorted(self.hooks.items())
+            trips = sorted(self.trips.items())
+            violations = sorted(self.violations.items())
+            for (plugin, hook), st in items:
+                labels = f'plugin="{_escape(plugin)}",hook="{_escape(hook)}"'
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS_MS, st.buckets):
+                    cumulative += count
+                    lines.append(f'fwgp_plugin_hook_latency_ms_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+                cumulative += st.buckets[-1]
+                lines.append(f'fwgp_plugin_hook_latency_ms_bucket{{{labels},le="+Inf"}} {cumulative}')
+                lines.append(f"fwgp_plugin_hook_latency_ms_sum{{{labels}}} {st.latency_sum_ms:.3f}")
+                lines.append(f"fwgp_plugin_hook_latency_ms_count{{{labels}}} {cumulative}")
+            for name, attr in (("calls", "calls"), ("errors", "errors"), ("timeouts", "timeouts")):
+                lines.append(f"# TYPE fwgp_plugin_hook_{name}_total counter")
+                for (plugin, hook), st in items:
+                    labels = f'plugin="{_escape(plugin)}",hook="{_escape(hook)}"'
+                    lines.append(f"fwgp_plugin_hook_{name}_total{{{labels}}} {getattr(st, attr)}")
+            lines.append("# TYPE fwgp_plugin_circuit_trips_total counter")
+            for plugin, count in trips:
+                lines.append(f'fwgp_plugin_circuit_trips_total{{plugin="{_escape(plugin)}"}} {count}')
+            lines.append("# TYPE fwgp_plugin_budget_violations_total counter")
+            for (plugin, kind), count in violations:
+                lines.append(f'fwgp_plugin_budget_violations_total{{plugin="{_escape(plugin)}",kind="{kind}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def maybe_flush(self) -> None:
+        if self._dirty and time.monotonic() - self._last_flush >= self.flush_interval_sec:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.path is None:
+            return
+        self._dirty = False
+        atomic_write_text(self.path, self.render())
+        self._last_flush = time.monotonic()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -1,132 +1,387 @@
 from __future__ import annotations
 
+import os
+import threading
 import time
-from typing import Dict, List, Optional
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
 
 from fwgp import events
 from fwgp.dispatcher import Dispatcher
-from fwgp.git_adapter import (
-    GitError,
-    add,
-    commit,
-    push,
-    staged_summary,
-)
+from fwgp.git_adapter import GitError, StatusSnapshot
 from fwgp.watcher import PollingWatcher
 from fwgp import git_adapter
 
+@dataclass
+class BatchPolicy:
+    """When to turn accumulated file events into one stage/commit/push.
 
-class Pipeline:
-    def __init__(self, repo_path: str, dispatcher: Dispatcher, logger, interval_sec: float = 2.0, watcher=None):
-        self.repo_path = repo_path
-        self.dispatcher = dispatcher
+    A batch is flushed once ``max_wait_sec`` has passed since its first
+    event, or when it reaches ``max_files`` paths or ``max_bytes`` of file
+    content (0 disables a limit). The default flushes on every change.
+    """
+
+    max_wait_sec: float = 0.0
+    max_files: int = 0
+    max_bytes: int = 0
+
+
+class RemoteSyncWorker:
+    """Runs the remote sync phase on its own thread and cadence.
+
+    ``sync`` returns True when it saw remote activity. The delay starts at
+    ``interval_sec`` and doubles after every idle sync up to
+    ``max_interval_sec``; ``poke`` resets it after local activity.
+    """
+
+    def __init__(self, sync: Callable[[], bool], logger, interval_sec: float, max_interval_sec: float):
+        self.sync = sync
         self.logger = logger
         self.interval_sec = interval_sec
-        self.watcher = watcher or PollingWatcher(repo_path)
-        self._running = False
+        self.max_interval_sec = max(max_interval_sec, interval_sec)
+        self._delay = interval_sec
+        self._next = 0.0
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
 
     def start(self):
-        self._running = True
-        self.logger.info("Watcher initialized for %s", self.repo_path)
-        while self._running:
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="fwgp-remote-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def poke(self):
+        self._delay = self.interval_sec
+        self._next = min(self._next, time.monotonic() + self.interval_sec)
+        self._wake.set()
+
+    def _run(self):
+        while not self._stopping:
+            remaining = self._next - time.monotonic()
+            if remaining > 0:
+                self._wake.wait(remaining)
+                self._wake.clear()
+                continue
             try:
-                self._tick()
-            except KeyboardInterrupt:
-                self.logger.info("Stopping pipeline (KeyboardInterrupt)")
-                self._running = False
+                active = self.sync()
             except Exception as e:
-                self.logger.error("Pipeline error: %s", e)
-            time.sleep(self.interval_sec)
+                self.logger.error("Remote sync error: %s", e)
+                active = False
+            if active:
+                self._delay = self.interval_sec
+            else:
+                self._delay = min(self._delay * 2, self.max_interval_sec)
+            self._next = time.monotonic() + self._delay
+
+
+DEFAULT_COMMIT_MESSAGE = "chore(auto): update files"
+
+
+class BasePipeline:
+    """Batching and per-phase helpers shared by ``Pipeline`` and ``AsyncPipeline``.
+
+    Subclasses run the remote sync and stage/commit/push phases with their
+    own git and hook calls; the requests sent to plugins and the logging
+    around each git step are built here so both behave the same.
+    """
+
+    def __init__(self, repo_path: str, dispatcher: Dispatcher, logger, interval_sec: float = 2.0, watcher=None,
+                 sync_interval_sec: Optional[float] = None, max_sync_interval_sec: float = 300.0,
+                 batch_policy: Optional[BatchPolicy] = None, remote: Optional[str] = None,
+                 branch: Optional[str] = None):
+        self.repo_path = repo_path
+        self.remote = remote
+        self.branch = branch
+        self.dispatcher = dispatcher
+        self.logger = logger
+        self.interval_sec = interval_sec
+        self.watcher = watcher or PollingWatcher(repo_path)
+        self._last_fetched: Optional[str] = None
+        self.batch_policy = batch_policy or BatchPolicy()
+        self._batch: Dict[str, events.FileDetectedEvent] = {}
+        self._batch_sizes: Dict[str, int] = {}
+        self._batch_bytes = 0
+        self._batch_started = 0.0
+        self.sync_interval_sec = sync_interval_sec if sync_interval_sec is not None else interval_sec
+        self.max_sync_interval_sec = max(max_sync_interval_sec, self.sync_interval_sec)
+        self._running = False
 
     def stop(self):
         self._running = False
 
-    def _tick(self):
-        # Optional: pre-sync with remote to reduce push failures
-        ctx = self._ctx()
+    def _enqueue(self, changes: List[events.FileDetectedEvent]):
+        if not self._batch:
+            self._batch_started = time.monotonic()
+        for evt in changes:
+            self._batch[evt.path] = evt
+            size = 0
+            if evt.change_type != events.ChangeType.DELETED:
+                try:
+                    size = os.stat(evt.path).st_size
+                except OSError:
+                    pass
+            self._batch_bytes += size - self._batch_sizes.get(evt.path, 0)
+            self._batch_sizes[evt.path] = size
+
+    def _batch_due(self) -> bool:
+        if not self._batch:
+            return False
+        policy = self.batch_policy
+        if policy.max_files and len(self._batch) >= policy.max_files:
+            return True
+        if policy.max_bytes and self._batch_bytes >= policy.max_bytes:
+            return True
+        return time.monotonic() - self._batch_started >= policy.max_wait_sec
+
+    def _batch_wait(self, timeout: float) -> float:
+        if not self._batch:
+            return timeout
+        remaining = self._batch_started + self.batch_policy.max_wait_sec - time.monotonic()
+        return max(0.0, min(timeout, remaining))
+
+    def _take_batch(self) -> List[events.FileDetectedEvent]:
+        batch = list(self._batch.values())
+        self._batch.clear()
+        self._batch_sizes.clear()
+        self._batch_bytes = 0
+        return batch
+
+    def _requeue(self, batch: List[events.FileDetectedEvent]):
+        # Put back a batch that failed to stage; newer events for a path win
+        newer = self._take_batch()
+        self._enqueue(batch)
+        self._enqueue(newer)
+
+    def _pull_request(self, ctx: Dict[str, object]) -> Optional[events.PullRequest]:
+        # None when no remote is configured: remote sync is skipped
+        remote = ctx.get("remote")
+        branch = ctx.get("branch")
+        if not (remote and branch):
+            return None
+        return events.PullRequest(remote=remote, branch=branch)
+
+    def _conflicts(self, snapshot: StatusSnapshot, allow_pull: bool, ctx: Dict[str, object]) -> List[str]:
+        ctx["git_status"] = snapshot
+        conflicts = list(snapshot.unmerged)
+        if allow_pull and conflicts:
+            self.logger.warning("Merge conflicts detected: %s", ", ".join(conflicts))
+        return conflicts
+
+    def _log_staged(self, paths: List[str], timings: List[Tuple[int, float]]):
+        if len(timings) > 1:
+            self.logger.info("Staged %d paths in %d chunks (%s)", len(paths), len(timings),
+                             ", ".join("%d in %.2fs" % t for t in timings))
+
+    def _commit_request(self, changes: List[events.FileDetectedEvent], snapshot: StatusSnapshot,
+                        ctx: Dict[str, object]) -> events.CommitRequest:
+        ctx["git_status"] = snapshot
+        return events.CommitRequest(staged_summary=list(snapshot.staged), repo=self.repo_path, events=changes)
+
+    def _log_commit(self, sha: Optional[str]):
+        if sha:
+            self.logger.info("Committed %s", sha)
+        else:
+            self.logger.info("No changes to commit")
+
+    def _push_request(self, ctx: Dict[str, object]) -> Optional[events.PushRequest]:
+        # Push is best-effort and needs remote tracking set up by the TUI
         remote = ctx.get("remote")
         branch = ctx.get("branch")
-        if remote and branch:
-            allow_pull, strategy = self.dispatcher.before_pull(events.PullRequest(remote=remote, branch=branch), ctx)
-            if allow_pull:
+        if not (remote and branch):
+            return None
+        return events.PushRequest(remote=remote, branch=branch)
+
+    def _stage_paths(self, changes: List[events.FileDetectedEvent]) -> List[str]:
+        return [
+            c.path.replace(self.repo_path + "/", "").replace(self.repo_path + "\\", "")
+            for c in changes
+            if c.change_type != events.ChangeType.DELETED
+        ]
+
+    def _ctx(self) -> Dict[str, object]:
+        # Execution context shared with plugins
+        return {
+            "logger": self.logger,
+            "repo_path": self.repo_path,
+            "remote": self.remote,
+            "branch": self.branch,
+        }
+
+
+class Pipeline(BasePipeline):
+    def __init__(self, repo_path: str, dispatcher: Dispatcher, logger, interval_sec: float = 2.0, watcher=None,
+                 sync_interval_sec: Optional[float] = None, max_sync_interval_sec: float = 300.0,
+                 batch_policy: Optional[BatchPolicy] = None, persistent_git: bool = False,
+                 remote: Optional[str] = None, branch: Optional[str] = None):
+        super().__init__(repo_path, dispatcher, logger, interval_sec=interval_sec, watcher=watcher,
+                         sync_interval_sec=sync_interval_sec, max_sync_interval_sec=max_sync_interval_sec,
+                         batch_policy=batch_policy, remote=remote, branch=branch)
+        # Serialises index/HEAD mutations: the remote worker's merge against
+        # the local stage/commit/push phase.
+        self._git_lock = threading.Lock()
+        # Optional long-lived cat-file processes for ref/object lookups
+        self.git = git_adapter.GitWorker(repo_path) if persistent_git else None
+        # One porcelain=v2 status per index change, shared by both threads
+        self.status = git_adapter.StatusCache(repo_path)
+        self.remote_sync = RemoteSyncWorker(
+            lambda: self._sync_remote(self._ctx()),
+            logger,
+            interval_sec=self.sync_interval_sec,
+            max_interval_sec=self.max_sync_interval_sec,
+        )
+
+    def start(self):
+        self._running = True
+        self.logger.info("Watcher initialized for %s", self.repo_path)
+        self.remote_sync.start()
+        try:
+            while self._running:
                 try:
-                    git_adapter.pull(self.repo_path, remote, branch)
-                except git_adapter.GitError as ge:
-                    self.logger.warning("git pull failed: %s", ge)
-                # Detect conflicts and notify
-                conflicts = git_adapter.list_conflicts(self.repo_path)
-                if conflicts:
-                    self.logger.warning("Merge conflicts detected: %s", ", ".join(conflicts))
-                    self.dispatcher.on_conflict(events.ConflictInfo(files=conflicts), ctx)
-            # Always emit afterPull with whether updates or conflicts were seen
-            conflicts = git_adapter.list_conflicts(self.repo_path)
-            self.dispatcher.after_pull(events.PullResult(updated=True, conflicts=conflicts or None), ctx)
+                    changes = self.watcher.poll_changes()
+                    if changes:
+                        self._process_changes(changes, self._ctx())
+                    elif self._batch_due():
+                        self._flush_batch(self._ctx())
+                except KeyboardInterrupt:
+                    self.logger.info("Stopping pipeline (KeyboardInterrupt)")
+                    self._running = False
+                except Exception as e:
+                    self.logger.error("Pipeline error: %s", e)
+                if self._running:
+                    self._wait(self._batch_wait(self.interval_sec))
+        finally:
+            self.remote_sync.stop()
+            if self._batch:
+                self._flush_batch(self._ctx())
+            if self.git is not None:
+                self.git.close()
+
+    def _wait(self, timeout: float):
+        # Event-based watchers wake us as soon as a batch is ready
+        wait_for_changes = getattr(self.watcher, "wait_for_changes", None)
+        if wait_for_changes is not None:
+            wait_for_changes(timeout)
+        else:
+            time.sleep(timeout)
 
+    def _tick(self):
+        ctx = self._ctx()
+        self._sync_remote(ctx)
         changes = self.watcher.poll_changes()
-        if not changes:
-            return
-        # Notify plugins about file detections
-        for evt in changes:
-            self.dispatcher.on_file_detected(evt, ctx)
+        if changes:
+            self._process_changes(changes, ctx)
+
+    def _sync_remote(self, ctx: Dict[str, object]) -> bool:
+        # Fetch, then fast-forward (or merge) only when the fetched ref moved.
+        # Returns True when HEAD changed or conflicts are present.
+        pull_req = self._pull_request(ctx)
+        if pull_req is None:
+            return False
+        updated = False
+        allow_pull, strategy = self.dispatcher.before_pull(pull_req, ctx)
+        if allow_pull:
+            fetched = None
+            try:
+                git_adapter.fetch(self.repo_path, pull_req.remote, pull_req.branch)
+                fetched = git_adapter.rev_parse(self.repo_path, "FETCH_HEAD", worker=self.git)
+            except GitError as ge:
+                self.logger.warning("git fetch failed: %s", ge)
+            if fetched and fetched != self._last_fetched:
+                with self._git_lock:
+                    merged, updated = self._merge(fetched)
+                if merged:
+                    self._last_fetched = fetched
+        # Detect conflicts and notify
+        try:
+            snapshot = self.status.get()
+        except GitError as ge:
+            self.logger.warning("git status failed: %s", ge)
+            snapshot = StatusSnapshot()
+        conflicts = self._conflicts(snapshot, allow_pull, ctx)
+        if allow_pull and conflicts:
+            self.dispatcher.on_conflict(events.ConflictInfo(files=conflicts), ctx)
+        # Always emit afterPull with whether updates or conflicts were seen
+        self.dispatcher.after_pull(events.PullResult(updated=updated, conflicts=conflicts or None), ctx)
+        return updated or bool(conflicts)
+
+    def _merge(self, fetched: str) -> Tuple[bool, bool]:
+        # Caller holds the git lock; returns (merged, HEAD moved)
+        before = git_adapter.head_sha(self.repo_path, worker=self.git)
+        merged = True
+        try:
+            git_adapter.merge(self.repo_path, fetched, ff_only=True)
+        except GitError:
+            try:
+                git_adapter.merge(self.repo_path, fetched)
+            except GitError as ge:
+                self.logger.warning("git merge failed: %s", ge)
+                merged = False
+        return merged, git_adapter.head_sha(self.repo_path, worker=self.git) != before
+
+    def _process_changes(self, changes: List[events.FileDetectedEvent], ctx: Dict[str, object]):
+        self.status.invalidate()
+        # Notify plugins about file detections, then add them to the batch
+        self.dispatcher.on_files_detected(changes, ctx)
+        self._enqueue(changes)
+        if self._batch_due():
+            self._flush_batch(ctx)
+
+    def _flush_batch(self, ctx: Dict[str, object]):
+        batch = self._take_batch()
+        with self._git_lock:
+            self._stage_commit_push(batch, ctx)
+        # Local activity: peers are likely active too
+        self.remote_sync.poke()
 
+    def _stage_commit_push(self, changes: List[events.FileDetectedEvent], ctx: Dict[str, object]):
         # Stage phase
-        paths = [c.path.replace(self.repo_path+"/", "").replace(self.repo_path+"\\", "") for c in changes if c.change_type != events.ChangeType.DELETED]
+        paths = self._stage_paths(changes)
         stage_req = events.StageRequest(paths=paths, repo=self.repo_path, ctx={})
         allow, reasons = self.dispatcher.before_stage(stage_req, ctx)
         if not allow:
             self.logger.warning("Stage blocked by plugins: %s", "; ".join(reasons) or "no reason")
             return
         try:
-            add(self.repo_path, paths)
+            self._log_staged(paths, git_adapter.add(self.repo_path, paths))
         except GitError as ge:
             self.logger.error("git add failed: %s", ge)
+            self._requeue(changes)
             return
         self.dispatcher.after_stage(stage_req, ctx)
 
         # Commit phase
         try:
-            summary = staged_summary(self.repo_path)
+            snapshot = self.status.get()
         except GitError as ge:
-            self.logger.error("git staged summary failed: %s", ge)
+            self.logger.error("git status failed: %s", ge)
             return
-        commit_req = events.CommitRequest(staged_summary=summary, repo=self.repo_path)
-        allow, msg_override, sign = self.dispatcher.before_commit(commit_req, ctx)
+        allow, msg_override, sign = self.dispatcher.before_commit(self._commit_request(changes, snapshot, ctx), ctx)
         if not allow:
             self.logger.warning("Commit blocked by plugins")
             return
-        message = msg_override or "chore(auto): update files"
-        sha = None
         try:
-            sha = commit(self.repo_path, message, sign=bool(sign))
-            if sha:
-                self.logger.info("Committed %s", sha)
-            else:
-                self.logger.info("No changes to commit")
+            sha = git_adapter.commit(self.repo_path, msg_override or DEFAULT_COMMIT_MESSAGE, sign=bool(sign),
+                                     worker=self.git)
         except GitError as ge:
             self.logger.error("git commit failed: %s", ge)
             return
+        self._log_commit(sha)
         self.dispatcher.after_commit(sha, ctx)
 
-        # Push phase (best-effort; requires remote tracking set up by TUI)
-        remote = ctx.get("remote")
-        branch = ctx.get("branch")
-        if remote and branch:
-            allow_push, force = self.dispatcher.before_push(
-                events.PushRequest(remote=remote, branch=branch), ctx
-            )
+        # Push phase
+        push_req = self._push_request(ctx)
+        if push_req is not None:
+            allow_push, force = self.dispatcher.before_push(push_req, ctx)
             if allow_push:
                 try:
-                    push(self.repo_path, remote, branch, force=bool(force))
-                    self.logger.info("Pushed to %s/%s", remote, branch)
+                    git_adapter.push(self.repo_path, push_req.remote, push_req.branch, force=bool(force))
+                    self.logger.info("Pushed to %s/%s", push_req.remote, push_req.branch)
                 except GitError as ge:
                     self.logger.warning("git push failed: %s", ge)
-            self.dispatcher.after_push(events.PushRequest(remote=remote, branch=branch), ctx)
-
-    def _ctx(self) -> Dict[str, object]:
-        # Execution context shared with plugins
-        return {
-            "logger": self.logger,
-            "repo_path": self.repo_path,
-            "remote": None,  # filled by caller via wrapper if needed
-            "branch": None,  # filled by caller via wrapper if needed
-        }
+            self.dispatcher.after_push(push_req, ctx)
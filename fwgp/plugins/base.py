@@ -12,6 +12,7 @@ class PluginManifest:
     version: str = "0.1.0"
     author: Optional[str] = None
     description: Optional[str] = None
+    budgets: Optional[Dict[str, Any]] = None  # overrides for policy/performance.yml
 
 
 class BasePlugin:
@@ -26,6 +27,9 @@ class BasePlugin:
     def onFileDetected(self, evt: events.FileDetectedEvent, ctx: Dict[str, Any]) -> None:
         return None
 
+    # onFilesDetected(evts, ctx) has no default: define it to take a whole
+    # tick at once, otherwise the dispatcher calls onFileDetected per event.
+
     def beforeStage(self, req: events.StageRequest, ctx: Dict[str, Any]) -> events.StageDecision:
         return events.StageDecision(allow=True)
 
@@ -52,3 +56,6 @@ class BasePlugin:
 
     def onConflict(self, info: events.ConflictInfo, ctx: Dict[str, Any]):
         return None
+
+    def onBudgetViolation(self, violation: events.BudgetViolation, ctx: Dict[str, Any]) -> None:
+        return None
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from fwgp import events
 from fwgp.plugins.base import BasePlugin, PluginManifest
@@ -18,3 +18,13 @@ class LintFormatter(BasePlugin):
         if logger:
             logger.info("[LintFormatter] Detected change: %s (%s)", evt.path, evt.change_type)
 
+    def onFilesDetected(self, evts: List[events.FileDetectedEvent], ctx: Dict[str, Any]) -> None:
+        logger = ctx.get("logger")
+        if not logger:
+            return
+        if len(evts) > 20:
+            logger.info("[LintFormatter] Detected %d changes", len(evts))
+            return
+        for evt in evts:
+            self.onFileDetected(evt, ctx)
+
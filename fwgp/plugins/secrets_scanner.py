@@ -1,17 +1,388 @@
 from __future__ import annotations
 
+import io
+import mmap
+import multiprocessing
+import os
 import re
-from typing import Any, Dict
+import threading
+import time
+from bisect import bisect_right
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any, BinaryIO, Dict, List, Optional, Pattern, Tuple
 
 from fwgp import events
+from fwgp.git_adapter import GitError, GitWorker, StagedBlob, open_blob, open_blob_diff, staged_blobs
+from fwgp.isolation import default_mp_context
 from fwgp.plugins.base import BasePlugin, PluginManifest
 
 
-SECRET_PATTERNS = [
-    re.compile(r"AKIA[0-9A-Z]{16}"),  # AWS Access Key ID
-    re.compile(r"(?i)api[_-]?key\s*[:=]\s*['\"][A-Za-z0-9\-_]{16,}['\"]"),
-    re.compile(r"(?i)secret\s*[:=]\s*['\"][A-Za-z0-9\-_]{16,}['\"]"),
+@dataclass(frozen=True)
+class SecretRule:
+    name: str
+    pattern: bytes  # bytes regex
+    ignore_case: bool = False
+    # Literals one of which starts every match (matched case-insensitively);
+    # rules without keywords are searched over the whole buffer.
+    keywords: Tuple[bytes, ...] = ()
+
+
+@dataclass(frozen=True)
+class SecretMatch:
+    rule: str
+    start: int
+    end: int
+    line: Optional[int] = None  # 1-based line in the staged file, when known
+
+
+def _trie_pattern(words: List[bytes]) -> bytes:
+    # Regex for a prefix trie of the words: the engine branches on one byte
+    # at a time, so every keyword is looked for in a single pass.
+    root: Dict[Optional[int], Any] = {}
+    for word in words:
+        node = root
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[None] = None
+
+    def emit(node) -> bytes:
+        alts = [re.escape(bytes([ch])) + emit(sub) for ch, sub in sorted(
+            (k, v) for k, v in node.items() if k is not None)]
+        if not alts:
+            return b""
+        body = alts[0] if len(alts) == 1 else b"(?:" + b"|".join(alts) + b")"
+        return b"(?:" + body + b")?" if None in node else body
+
+    return emit(root)
+
+
+_LEADING_FLAGS = re.compile(rb"\(\?([aiLmsux]+)\)")
+
+
+def _scoped(pattern: bytes, ignore_case: bool) -> bytes:
+    # Leading global flags such as (?i) are only legal at the very start of
+    # a regex, so turn them into a scoped (?i:...) group for the alternation
+    flags = b"i" if ignore_case else b""
+    m = _LEADING_FLAGS.match(pattern)
+    while m:
+        flags += m.group(1)
+        pattern = pattern[m.end():]
+        m = _LEADING_FLAGS.match(pattern)
+    return b"(?" + flags + b":" + pattern + b")" if flags else pattern
+
+
+class RuleSet:
+    """Rules matched in one pass per buffer through a keyword prefilter.
+
+    Keywords are compiled into a single trie regex (a stdlib stand-in for
+    Aho-Corasick) that runs over a lowercased copy of the buffer as a
+    lookahead, so overlapping keywords are all seen. Only at those offsets
+    are the rules anchored on a keyword tried, with ``match``. Rules
+    without keywords share one alternation regex; like any single regex it
+    reports non-overlapping matches, so where two of them overlap only the
+    leftmost (then earliest-listed) rule is reported.
+    """
+
+    def __init__(self, rules: List[SecretRule]):
+        self.rules = list(rules)
+        self._anchored: Dict[bytes, List[Tuple[str, Pattern[bytes]]]] = {}
+        loose: List[bytes] = []
+        self._loose_names: List[str] = []
+        for rule in self.rules:
+            if rule.keywords:
+                regex = re.compile(rule.pattern, re.IGNORECASE if rule.ignore_case else 0)
+                for kw in rule.keywords:
+                    self._anchored.setdefault(kw.lower(), []).append((rule.name, regex))
+            else:
+                loose.append(b"(?P<r%d>" % len(self._loose_names) + _scoped(rule.pattern, rule.ignore_case) + b")")
+                self._loose_names.append(rule.name)
+        self._lengths = sorted({len(kw) for kw in self._anchored})
+        self._prefilter: Optional[Pattern[bytes]] = (
+            re.compile(b"(?=(" + _trie_pattern(sorted(self._anchored)) + b"))") if self._anchored else None
+        )
+        self._loose: Optional[Pattern[bytes]] = re.compile(b"|".join(loose)) if loose else None
+
+    def finditer(self, buf, pos: int = 0, endpos: Optional[int] = None, offset: int = 0) -> List[SecretMatch]:
+        """All matches in ``buf[pos:endpos]`` ordered by start; overlapping
+        matches of different keyword-anchored rules are all reported."""
+        chunk = bytes(buf[pos:endpos])
+        base = offset + pos
+        found: List[SecretMatch] = []
+        if self._prefilter is not None:
+            for hit in self._prefilter.finditer(chunk.lower()):
+                i, text = hit.start(), hit.group(1)
+                # The trie reports the longest keyword; shorter ones that
+                # prefix it start here too.
+                for n in self._lengths:
+                    if n > len(text):
+                        break
+                    for name, regex in self._anchored.get(text[:n], ()):
+                        m = regex.match(chunk, i)
+                        if m:
+                            found.append(SecretMatch(name, base + m.start(), base + m.end()))
+        if self._loose is not None:
+            for m in self._loose.finditer(chunk):
+                found.append(SecretMatch(self._loose_names[int(m.lastgroup[1:])], base + m.start(), base + m.end()))
+        found.sort(key=lambda f: (f.start, f.end))
+        return found
+
+    def search(self, buf, pos: int = 0, endpos: Optional[int] = None, offset: int = 0) -> Optional[SecretMatch]:
+        found = self.finditer(buf, pos, endpos, offset)
+        return found[0] if found else None
+
+
+# Patterns run over raw bytes so files never need decoding
+DEFAULT_RULES: List[SecretRule] = [
+    SecretRule("aws-access-key-id", rb"AKIA[0-9A-Z]{16}", keywords=(b"AKIA",)),
+    SecretRule("generic-api-key", rb"api[_-]?key\s*[:=]\s*['\"][A-Za-z0-9\-_]{16,}['\"]", ignore_case=True,
+               keywords=(b"api",)),
+    SecretRule("generic-secret", rb"secret\s*[:=]\s*['\"][A-Za-z0-9\-_]{16,}['\"]", ignore_case=True,
+               keywords=(b"secret",)),
 ]
+SECRET_RULES = RuleSet(DEFAULT_RULES)
+
+CHUNK_SIZE = 1 << 20
+# Bytes carried over between chunks; a match up to this long is found even
+# when it straddles a chunk boundary.
+OVERLAP = 4096
+SNIFF_BYTES = 8192
+# Files at least this large are mapped instead of read
+MMAP_THRESHOLD = 8 << 20
+MAX_SCAN_BYTES = 64 << 20
+VERDICT_CACHE_SIZE = 100000
+PARALLEL_MIN_FILES = 64
+# Whole-commit budget when ctx carries no "hook_deadline" (direct calls)
+SCAN_DEADLINE_SEC = 4.0
+# Stop this far (at most a quarter of the budget) ahead of the dispatcher's
+# hook_deadline, so a slow scan blocks the commit instead of being abandoned
+# and merged as an allow
+SCAN_DEADLINE_MARGIN_SEC = 0.5
+
+
+class ScanDeadlineExceeded(Exception):
+    """A scan ran out of time before reaching the end of its input."""
+
+
+def _check_deadline(deadline: Optional[float]) -> None:
+    if deadline is not None and time.monotonic() >= deadline:
+        raise ScanDeadlineExceeded()
+
+
+def looks_binary(head: bytes) -> bool:
+    return b"\0" in head[:SNIFF_BYTES]
+
+
+def scan_stream(fh: BinaryIO, rules: RuleSet = SECRET_RULES, chunk_size: int = CHUNK_SIZE,
+                max_bytes: int = MAX_SCAN_BYTES, deadline: Optional[float] = None) -> Optional[SecretMatch]:
+    """First match in the first ``max_bytes`` of ``fh``, or None.
+
+    Reads ``chunk_size`` at a time, keeping the last ``OVERLAP`` bytes of
+    the previous chunk, so memory stays at about one chunk. Binary content
+    (a NUL in the first chunk) is skipped. Text streams are encoded.
+    Raises ``ScanDeadlineExceeded`` once ``time.monotonic()`` passes
+    ``deadline``, checked before every chunk.
+    """
+    tail = b""
+    consumed = 0
+    first = True
+    while consumed < max_bytes:
+        _check_deadline(deadline)
+        chunk = fh.read(min(chunk_size, max_bytes - consumed))
+        if not chunk:
+            return None
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8", "ignore")
+        if first and looks_binary(chunk):
+            return None
+        first = False
+        buf = tail + chunk
+        found = rules.search(buf, offset=consumed - len(tail))
+        if found:
+            return found
+        consumed += len(chunk)
+        tail = buf[-OVERLAP:]
+    return None
+
+
+def scan_file(path: str, rules: RuleSet = SECRET_RULES, chunk_size: int = CHUNK_SIZE,
+              max_bytes: int = MAX_SCAN_BYTES, deadline: Optional[float] = None) -> Optional[SecretMatch]:
+    with open(path, "rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            return scan_stream(fh, rules, chunk_size, max_bytes, deadline)
+        # Large files are mapped and searched window by window, so only one
+        # chunk is copied at a time.
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if looks_binary(mm[:SNIFF_BYTES]):
+                return None
+            limit = min(size, max_bytes)
+            for start in range(0, limit, chunk_size):
+                _check_deadline(deadline)
+                found = rules.search(mm, max(0, start - OVERLAP), min(start + chunk_size, limit))
+                if found:
+                    return found
+            return None
+
+
+_HUNK = re.compile(rb"@@ -\d+(?:,\d+)? \+(\d+)")
+
+
+class AddedLines:
+    """File-like view of only the added lines of a unified diff stream.
+
+    ``line_at`` maps an offset into what ``read`` returned back to the line
+    of the new file it came from.
+    """
+
+    def __init__(self, raw: BinaryIO):
+        self.raw = raw
+        self._buf = b""
+        # "---"/"+++" are file headers only before a file's first hunk; in
+        # a hunk, "+++ x" is an added line reading "++ x"
+        self._in_hunk = False
+        self._line = 0
+        self._pos = 0
+        self._offsets: List[int] = []
+        self._lines: List[int] = []
+
+    def read(self, n: int) -> bytes:
+        parts = [self._buf]
+        have = len(self._buf)
+        while have < n:
+            line = self.raw.readline()
+            if not line:
+                break
+            if line.startswith(b"@@"):
+                self._in_hunk = True
+                m = _HUNK.match(line)
+                self._line = int(m.group(1)) if m else 0
+            elif line.startswith(b"diff "):
+                self._in_hunk = False
+            elif self._in_hunk and line.startswith(b"+"):
+                self._offsets.append(self._pos)
+                self._lines.append(self._line)
+                self._pos += len(line) - 1
+                self._line += 1
+                parts.append(line[1:])
+                have += len(line) - 1
+            elif self._in_hunk and line.startswith(b" "):
+                self._line += 1
+        data = b"".join(parts)
+        self._buf = data[n:]
+        return data[:n]
+
+    def line_at(self, offset: int) -> Optional[int]:
+        i = bisect_right(self._offsets, offset) - 1
+        return self._lines[i] if i >= 0 else None
+
+
+def added_lines(old: bytes, new: bytes) -> Tuple[bytes, List[int], List[int]]:
+    """Lines of ``new`` that ``old`` does not already contain.
+
+    Returns them joined, with each one's offset in the result and its
+    1-based line number in ``new``. Lines are matched as a multiset, so a
+    moved line is not "added"; its content was scanned in ``old``.
+    """
+    remaining = Counter(old.split(b"\n"))
+    parts: List[bytes] = []
+    offsets: List[int] = []
+    numbers: List[int] = []
+    pos = 0
+    for number, line in enumerate(new.split(b"\n"), 1):
+        if remaining[line] > 0:
+            remaining[line] -= 1
+            continue
+        offsets.append(pos)
+        numbers.append(number)
+        parts.append(line + b"\n")
+        pos += len(line) + 1
+    return b"".join(parts), offsets, numbers
+
+
+def _read_blob(worker: GitWorker, sha: str) -> bytes:
+    data = worker.read_object(sha)
+    if data is None:
+        raise GitError(f"missing blob {sha}")
+    return data
+
+
+def scan_staged_blob(repo_path: str, blob: StagedBlob, chunk_size: int = CHUNK_SIZE,
+                     max_bytes: int = MAX_SCAN_BYTES, worker: Optional[GitWorker] = None,
+                     deadline: Optional[float] = None) -> Optional[SecretMatch]:
+    """Scan a new file's staged blob, or only the lines a modification adds.
+
+    Blobs are read through ``worker``'s long-lived ``cat-file --batch`` (a
+    temporary one when None); ones over ``max_bytes`` are streamed from a
+    one-off git process instead so they never have to be held in memory.
+    """
+    if worker is None:
+        worker = GitWorker(repo_path)
+        try:
+            return scan_staged_blob(repo_path, blob, chunk_size, max_bytes, worker, deadline)
+        finally:
+            worker.close()
+    shas = [sha for sha in (blob.old_sha, blob.new_sha) if sha]
+    if any((worker.object_info(sha) or (None, None, 0))[2] > max_bytes for sha in shas):
+        return _scan_staged_stream(repo_path, blob, chunk_size, max_bytes, deadline)
+    new = _read_blob(worker, blob.new_sha)
+    if blob.old_sha is None:
+        found = scan_stream(io.BytesIO(new), chunk_size=chunk_size, max_bytes=max_bytes, deadline=deadline)
+        if found:
+            found = replace(found, line=new.count(b"\n", 0, found.start) + 1)
+        return found
+    # Existing content was scanned when it was committed
+    if looks_binary(new[:SNIFF_BYTES]):
+        return None
+    added, offsets, numbers = added_lines(_read_blob(worker, blob.old_sha), new)
+    found = scan_stream(io.BytesIO(added), chunk_size=chunk_size, max_bytes=max_bytes, deadline=deadline)
+    if found:
+        found = replace(found, line=numbers[bisect_right(offsets, found.start) - 1])
+    return found
+
+
+def _scan_staged_stream(repo_path: str, blob: StagedBlob, chunk_size: int, max_bytes: int,
+                        deadline: Optional[float]) -> Optional[SecretMatch]:
+    if blob.old_sha is None:
+        proc = open_blob(repo_path, blob.new_sha)
+        stream: BinaryIO = proc.stdout
+    else:
+        proc = open_blob_diff(repo_path, blob.old_sha, blob.new_sha)
+        stream = AddedLines(proc.stdout)
+    ok = True
+    try:
+        found = scan_stream(stream, chunk_size=chunk_size, max_bytes=max_bytes, deadline=deadline)
+        # Unread output means the byte budget or binary sniffing ended the
+        # scan early; otherwise git must have exited cleanly.
+        if found is None and not proc.stdout.read(1):
+            ok = proc.wait() == 0
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        proc.stdout.close()
+    if not ok:
+        raise GitError(f"could not read staged content of {blob.path}")
+    if found and isinstance(stream, AddedLines):
+        found = replace(found, line=stream.line_at(found.start))
+    return found
+
+
+# Per pool process: one cat-file worker per repository
+_task_workers: Dict[str, GitWorker] = {}
+
+
+def _scan_task(repo_path: str, rel: str, blob: Optional[StagedBlob], chunk_size: int,
+               max_bytes: int, deadline: float) -> Optional[SecretMatch]:
+    # Pool entry point; without a blob the working-tree file is scanned.
+    # time.monotonic() is system-wide, so the parent's deadline holds here.
+    if blob is None:
+        return scan_file(f"{repo_path}/{rel}", chunk_size=chunk_size, max_bytes=max_bytes, deadline=deadline)
+    repo_path = repo_path or "."
+    worker = _task_workers.get(repo_path)
+    if worker is None:
+        worker = _task_workers[repo_path] = GitWorker(repo_path)
+    return scan_staged_blob(repo_path, blob, chunk_size, max_bytes, worker, deadline)
 
 
 class SecretsScanner(BasePlugin):
@@ -21,25 +392,237 @@ class SecretsScanner(BasePlugin):
         description="Blocks commit if potential secrets are detected in staged files.",
     )
 
+    def __init__(self, chunk_size: int = CHUNK_SIZE, max_scan_bytes: int = MAX_SCAN_BYTES,
+                 cache_size: int = VERDICT_CACHE_SIZE, workers: Optional[int] = None,
+                 parallel_min_files: int = PARALLEL_MIN_FILES, scan_deadline_sec: Optional[float] = None,
+                 mp_context: Optional[str] = None):
+        super().__init__()
+        self.chunk_size = chunk_size
+        # Per-file budget: only the first max_scan_bytes of a file are scanned
+        self.max_scan_bytes = max_scan_bytes
+        # Verdicts by blob id ("<sha>") or blob pair ("<old>..<new>"); shared
+        # by every repo this instance serves.
+        self.cache_size = cache_size
+        self._verdicts: "OrderedDict[str, Optional[SecretMatch]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Commits with at least parallel_min_files unscanned files are spread
+        # over a process pool (matching holds the GIL); workers <= 1 disables it.
+        self.workers = workers if workers is not None else min(8, os.cpu_count() or 1)
+        self.parallel_min_files = parallel_min_files
+        # Whole-commit budget, checked between chunks; running out blocks the
+        # commit. Derived from the hook deadline unless set (then a cap).
+        self.scan_deadline_sec = scan_deadline_sec
+        # Start method for the pool; defaults to forkserver/spawn because the
+        # dispatcher process is threaded
+        self.mp_context = mp_context
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        # cat-file workers for serial scans, by repository
+        self._git_workers: Dict[str, GitWorker] = {}
+
+    def _cached(self, key: str) -> Tuple[bool, Optional[SecretMatch]]:
+        with self._cache_lock:
+            if key not in self._verdicts:
+                return False, None
+            self._verdicts.move_to_end(key)
+            return True, self._verdicts[key]
+
+    def _remember(self, key: str, found: Optional[SecretMatch]) -> None:
+        with self._cache_lock:
+            self._verdicts[key] = found
+            self._verdicts.move_to_end(key)
+            while len(self._verdicts) > self.cache_size:
+                self._verdicts.popitem(last=False)
+
+    def _lookup(self, blob: StagedBlob) -> Tuple[str, bool, Optional[SecretMatch]]:
+        # A clean verdict for the whole new blob covers its added lines too
+        hit, found = self._cached(blob.new_sha)
+        if hit and (found is None or blob.old_sha is None):
+            return blob.new_sha, True, found
+        if blob.old_sha is None:
+            return blob.new_sha, False, None
+        key = f"{blob.old_sha}..{blob.new_sha}"
+        hit, found = self._cached(key)
+        return key, hit, found
+
+    def _scan(self, path: str, ctx: Dict[str, Any], deadline: Optional[float] = None) -> Optional[SecretMatch]:
+        opener = ctx.get("open_file")
+        if opener is None:
+            return scan_file(path, chunk_size=self.chunk_size, max_bytes=self.max_scan_bytes, deadline=deadline)
+        fh = opener(path)
+        try:
+            return scan_stream(fh, chunk_size=self.chunk_size, max_bytes=self.max_scan_bytes, deadline=deadline)
+        finally:
+            close = getattr(fh, "close", None)
+            if close is not None:
+                close()
+
+    def _staged_blobs(self, repo_path: str, ctx: Dict[str, Any]) -> Optional[Dict[str, StagedBlob]]:
+        # Scan what is staged rather than the working tree; fall back to the
+        # working tree outside a git repo or when a test injects open_file.
+        if ctx.get("open_file") is not None:
+            return None
+        try:
+            return staged_blobs(repo_path or ".")
+        except (GitError, OSError):
+            return None
+
+    def _git_worker(self, repo_path: str) -> GitWorker:
+        with self._pool_lock:
+            worker = self._git_workers.get(repo_path)
+            if worker is None:
+                worker = self._git_workers[repo_path] = GitWorker(repo_path)
+            return worker
+
+    def _get_pool(self, logger):
+        with self._pool_lock:
+            if self._pool is None:
+                try:
+                    ctx = multiprocessing.get_context(self.mp_context or default_mp_context())
+                    self._pool = ctx.Pool(self.workers)
+                except Exception as e:
+                    # e.g. running inside a daemonic plugin worker process
+                    if logger:
+                        logger.warning("[SecretsScanner] parallel scan unavailable: %s", e)
+                    self.workers = 1
+            return self._pool
+
+    def close(self) -> None:
+        """Terminate the scan pool and the cat-file workers."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+            workers = list(self._git_workers.values())
+            self._git_workers.clear()
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+        for worker in workers:
+            worker.close()
+
+    def _drop_pool(self, pool) -> None:
+        # Abandoned tasks may still be running; kill them with the pool
+        with self._pool_lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.terminate()
+
+    def _deadline(self, ctx: Dict[str, Any]) -> float:
+        now = time.monotonic()
+        hook_deadline = ctx.get("hook_deadline")
+        if hook_deadline is None:
+            budget = self.scan_deadline_sec if self.scan_deadline_sec is not None else SCAN_DEADLINE_SEC
+            return now + budget
+        budget = max(0.0, hook_deadline - now)
+        deadline = hook_deadline - min(SCAN_DEADLINE_MARGIN_SEC, budget / 4)
+        if self.scan_deadline_sec is not None:
+            deadline = min(deadline, now + self.scan_deadline_sec)
+        return deadline
+
+    # Both scanners return (results, failed, timed_out): failed lists
+    # (path, error) for files that could not be read; either blocks the commit.
+    def _scan_serial(self, jobs, repo_path: str, ctx: Dict[str, Any], deadline: float):
+        results, failed = [], []
+        for rel, blob, key in jobs:
+            try:
+                if blob is None:
+                    found = self._scan(f"{repo_path}/{rel}", ctx, deadline)
+                else:
+                    found = scan_staged_blob(repo_path or ".", blob, self.chunk_size, self.max_scan_bytes,
+                                             self._git_worker(repo_path or "."), deadline)
+            except ScanDeadlineExceeded:
+                return results, failed, True
+            except FileNotFoundError as e:
+                if blob is not None:
+                    failed.append((rel, str(e)))
+                continue  # working-tree fallback: a staged deletion
+            except Exception as e:
+                failed.append((rel, str(e) or type(e).__name__))
+                continue
+            results.append((rel, key, found))
+        return results, failed, False
+
+    def _scan_parallel(self, pool, jobs, repo_path: str, deadline: float):
+        pending = [
+            (rel, key, pool.apply_async(_scan_task, (repo_path, rel, blob, self.chunk_size, self.max_scan_bytes,
+                                                     deadline)))
+            for rel, blob, key in jobs
+        ]
+        results, failed = [], []
+        for rel, key, res in pending:
+            try:
+                found = res.get(timeout=max(0.0, deadline - time.monotonic()))
+            except multiprocessing.TimeoutError:
+                self._drop_pool(pool)
+                return results, failed, True
+            except ScanDeadlineExceeded:
+                # The remaining tasks see the same deadline and end quickly
+                return results, failed, True
+            except FileNotFoundError as e:
+                if key is not None:
+                    failed.append((rel, str(e)))
+                continue  # working-tree fallback: a staged deletion
+            except Exception as e:
+                failed.append((rel, str(e) or type(e).__name__))
+                continue
+            results.append((rel, key, found))
+        return results, failed, False
+
     def beforeCommit(self, req: events.CommitRequest, ctx: Dict[str, Any]) -> events.CommitDecision:
         repo_path: str = ctx.get("repo_path", "")
-        # Lightweight scan: Open files by name (staged summary) and scan contents.
-        offenders = []
+        logger = ctx.get("logger")
+        started = time.monotonic()
+        deadline = self._deadline(ctx)
+        blobs = self._staged_blobs(repo_path, ctx)
+        offenders: List[Tuple[str, SecretMatch]] = []
+        jobs: List[Tuple[str, Optional[StagedBlob], Optional[str]]] = []
         for rel in req.staged_summary:
-            try:
-                content = (ctx.get("open_file") or (lambda p: open(p, "r", encoding="utf-8", errors="ignore")))(
-                    f"{repo_path}/{rel}"
-                ).read()
-            except Exception:
-                continue
-            for pat in SECRET_PATTERNS:
-                if pat.search(content):
-                    offenders.append(rel)
-                    break
-        if offenders:
+            if blobs is None:
+                jobs.append((rel, None, None))
+            elif rel in blobs:
+                key, hit, found = self._lookup(blobs[rel])
+                if not hit:
+                    jobs.append((rel, blobs[rel], key))
+                elif found:
+                    offenders.append((rel, found))
+            # else: deleted
+        pool = None
+        if len(jobs) >= self.parallel_min_files and self.workers > 1 and ctx.get("open_file") is None:
+            pool = self._get_pool(logger)
+        if pool is not None:
+            results, failed, timed_out = self._scan_parallel(pool, jobs, repo_path, deadline)
+        else:
+            results, failed, timed_out = self._scan_serial(jobs, repo_path, ctx, deadline)
+        for rel, key, found in results:
+            if key is not None:
+                self._remember(key, found)
+            if found:
+                offenders.append((rel, found))
+        if logger:
+            for rel, found in offenders:
+                if found.line is not None:
+                    logger.warning("[SecretsScanner] %s: %s at line %d", rel, found.rule, found.line)
+                else:
+                    logger.warning("[SecretsScanner] %s: %s at byte %d", rel, found.rule, found.start)
+            if blobs is None:
+                for rel, _, _ in results:
+                    if self._over_budget(f"{repo_path}/{rel}"):
+                        logger.warning("[SecretsScanner] %s exceeds %d bytes; only its head was scanned", rel,
+                                       self.max_scan_bytes)
+            for rel, error in failed:
+                logger.warning("[SecretsScanner] could not scan %s (%s); blocking commit", rel, error)
+            if timed_out:
+                logger.warning("[SecretsScanner] scan deadline of %.1fs exceeded with %d of %d files unscanned; "
+                               "blocking commit", max(0.0, deadline - started),
+                               len(jobs) - len(results) - len(failed), len(jobs))
+        if offenders or failed or timed_out:
             return events.CommitDecision(
                 allow=False,
                 message_override=None,
             )
         return events.CommitDecision(allow=True)
 
+    def _over_budget(self, path: str) -> bool:
+        try:
+            return os.path.getsize(path) > self.max_scan_bytes
+        except OSError:
+            return False
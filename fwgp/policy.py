@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class PluginBudget:
+    """Effective limits for one plugin.
+
+    ``latency_ms``/``memory_mb`` are soft budgets that only raise violations;
+    ``timeout_ms``/``max_memory_mb`` are hard limits the dispatcher enforces.
+    """
+
+    latency_ms: float
+    timeout_ms: float
+    memory_mb: float
+    max_memory_mb: float
+    max_concurrency: int
+
+
+@dataclass
+class PerformancePolicy:
+    """Runtime view of ``policy/performance.yml``."""
+
+    latency_default_ms: float = 1000.0
+    latency_max_ms: float = 5000.0
+    memory_default_mb: float = 128.0
+    memory_max_mb: float = 512.0
+    default_concurrency: int = 1
+    max_concurrency: int = 5
+
+    @property
+    def plugin_workers(self) -> int:
+        return max(1, min(self.default_concurrency, self.max_concurrency))
+
+    def budget_for(self, overrides: Optional[Dict[str, Any]] = None) -> PluginBudget:
+        # Overrides use the performance.yml shape, e.g. from a manifest:
+        # {"latency_ms": {"default": 200, "max": 1000}, "max_concurrency": 2}
+        o = overrides or {}
+        latency = o.get("latency_ms") or {}
+        memory = o.get("memory_mb") or {}
+        return PluginBudget(
+            latency_ms=float(latency.get("default", self.latency_default_ms)),
+            timeout_ms=float(latency.get("max", self.latency_max_ms)),
+            memory_mb=float(memory.get("default", self.memory_default_mb)),
+            max_memory_mb=float(memory.get("max", self.memory_max_mb)),
+            # A manifest may lower the cap but never raise it past the policy
+            max_concurrency=max(1, min(int(o.get("max_concurrency", self.max_concurrency)), self.max_concurrency)),
+        )
+
+
+def load_performance_policy(path: str) -> PerformancePolicy:
+    # PyYAML is optional; without it (or the file) the defaults apply
+    try:
+        import yaml  # type: ignore
+        raw: Dict[str, Any] = yaml.safe_load(Path(path).read_text(encoding="utf-8")) or {}
+    except Exception:
+        return PerformancePolicy()
+    budgets = raw.get("budgets") or {}
+    latency = budgets.get("latency_ms") or {}
+    memory = budgets.get("memory_mb") or {}
+    concurrency = raw.get("concurrency") or {}
+    defaults = PerformancePolicy()
+    return PerformancePolicy(
+        latency_default_ms=float(latency.get("default", defaults.latency_default_ms)),
+        latency_max_ms=float(latency.get("max", defaults.latency_max_ms)),
+        memory_default_mb=float(memory.get("default", defaults.memory_default_mb)),
+        memory_max_mb=float(memory.get("max", defaults.memory_max_mb)),
+        default_concurrency=int(concurrency.get("default_concurrency", defaults.default_concurrency)),
+        max_concurrency=int(concurrency.get("max_concurrency", defaults.max_concurrency)),
+    )
@@ -1,55 +1,316 @@
 from __future__ import annotations
 
+import atexit
 import json
+import os
+import threading
 import time
+import weakref
+from collections import deque
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Dict
+from typing import Deque, Dict, Iterable, Optional, Set, Tuple
+
+from fwgp.fsutil import atomic_write_text, file_lock
+
+# Stores not yet closed; flushed once at interpreter exit
+_open_stores: "weakref.WeakSet[StateStore]" = weakref.WeakSet()
+
+
+def _flush_open_stores():
+    for store in list(_open_stores):
+        store._flush_at_exit()
+
+
+atexit.register(_flush_open_stores)
+
+
+@dataclass
+class BreakerPolicy:
+    """When a circuit opens and how long it stays open.
+
+    A circuit opens once its last ``window_sec`` of calls holds at least
+    ``min_failures`` failures and a failure rate of ``failure_rate``. After
+    ``cooldown_sec`` one probe call is let through (half-open): success
+    closes the circuit, failure reopens it with the cool-down doubled up to
+    ``max_cooldown_sec``.
+    """
+
+    window_sec: float = 60.0
+    min_failures: int = 3
+    failure_rate: float = 0.5
+    cooldown_sec: float = 30.0
+    max_cooldown_sec: float = 900.0
 
 
 @dataclass
 class CircuitState:
     failures: int = 0
     last_failure_ts: float = 0.0
-    disabled: bool = False
+    disabled: bool = False  # open or half-open
+    opened_at: float = 0.0
+    cooldown_sec: float = 0.0
+    trips: int = 0
 
 
 class StateStore:
-    def __init__(self, base_dir: str):
+    """Circuit-breaker state per plugin and per ``plugin#hook``.
+
+    Updates stay in memory and are written behind: at most every
+    ``flush_interval_sec``, on ``flush``/``close`` and at exit. A flush takes
+    an inter-process file lock, merges this store's changed circuits into
+    what is on disk and replaces the file atomically.
+    """
+
+    def __init__(self, base_dir: str, policy: Optional[BreakerPolicy] = None, flush_interval_sec: float = 1.0):
         self.base_dir = base_dir
         self.path = Path(base_dir) / "data" / "state.json"
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock_path = self.path.with_name("state.json.lock")
+        self.policy = policy or BreakerPolicy()
+        self.flush_interval_sec = flush_interval_sec
         self.data: Dict[str, CircuitState] = {}
+        self._windows: Dict[str, Deque[Tuple[float, bool]]] = {}
+        self._probing: Set[str] = set()
+        self._dirty: Set[str] = set()
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+        # Held from snapshot to write so flushes land on disk in order
+        self._flush_lock = threading.Lock()
         self._load()
+        _open_stores.add(self)
 
-    def _load(self):
+    def _read_disk(self) -> Dict[str, dict]:
         if not self.path.exists():
-            return
+            return {}
         try:
             raw = json.loads(self.path.read_text(encoding="utf-8"))
-            for k, v in raw.get("circuits", {}).items():
-                self.data[k] = CircuitState(**v)
+            return {k: dict(v) for k, v in raw.get("circuits", {}).items()}
         except Exception:
             # start fresh on corrupt state
-            self.data = {}
+            return {}
+
+    def _load(self):
+        for k, v in self._read_disk().items():
+            try:
+                self.data[k] = CircuitState(**v)
+            except TypeError:
+                continue
+
+    @staticmethod
+    def _ck(plugin_key: str, hook: Optional[str]) -> str:
+        return plugin_key if hook is None else f"{plugin_key}#{hook}"
+
+    def _keys(self, plugin_key: str, hook: Optional[str]) -> Iterable[str]:
+        # The plugin-wide circuit always applies; hook=None also covers
+        # every per-hook circuit of the plugin.
+        if hook is not None:
+            return (plugin_key, self._ck(plugin_key, hook))
+        prefix = plugin_key + "#"
+        return [plugin_key] + [k for k in self.data if k.startswith(prefix)]
+
+    def circuit(self, plugin_key: str, hook: Optional[str] = None) -> CircuitState:
+        with self._lock:
+            return self.data.get(self._ck(plugin_key, hook), CircuitState())
 
-    def _save(self):
-        payload = {"circuits": {k: asdict(v) for k, v in self.data.items()}}
-        self.path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    def is_disabled(self, plugin_key: str, hook: Optional[str] = None) -> bool:
+        with self._lock:
+            return any(self.data.get(k, CircuitState()).disabled for k in self._keys(plugin_key, hook))
 
-    def record_failure(self, plugin_key: str):
-        st = self.data.get(plugin_key, CircuitState())
-        st.failures += 1
-        st.last_failure_ts = time.time()
-        if st.failures >= 3:
-            st.disabled = True
-        self.data[plugin_key] = st
-        self._save()
+    def is_open(self, plugin_key: str, hook: Optional[str] = None) -> bool:
+        """True while calls are rejected outright (open and cooling down)."""
+        now = time.time()
+        with self._lock:
+            return any(self._rejects(k, now) for k in self._keys(plugin_key, hook))
+
+    def _rejects(self, ck: str, now: float) -> bool:
+        st = self.data.get(ck)
+        if st is None or not st.disabled:
+            return False
+        return ck in self._probing or now < st.opened_at + st.cooldown_sec
+
+    def allow(self, plugin_key: str, hook: Optional[str] = None) -> bool:
+        """Whether a call may go ahead; claims the half-open probe if due."""
+        now = time.time()
+        with self._lock:
+            keys = list(self._keys(plugin_key, hook))
+            if any(self._rejects(k, now) for k in keys):
+                return False
+            for k in keys:
+                if self.data.get(k, CircuitState()).disabled:
+                    self._probing.add(k)
+            return True
+
+    def record_success(self, plugin_key: str, hook: Optional[str] = None):
+        self._record(plugin_key, hook, True)
+
+    def record_failure(self, plugin_key: str, hook: Optional[str] = None):
+        self._record(plugin_key, hook, False)
+
+    def _record(self, plugin_key: str, hook: Optional[str], ok: bool):
+        now = time.time()
+        with self._lock:
+            ck = self._ck(plugin_key, hook)
+            targets = [ck]
+            if ck != plugin_key and plugin_key in self._probing:
+                targets.append(plugin_key)
+            for k in targets:
+                if self._apply(k, ok, now):
+                    self._dirty.add(k)
+            if self._dirty:
+                self._schedule_flush()
+
+    def _apply(self, ck: str, ok: bool, now: float) -> bool:
+        # Returns True when persisted fields changed
+        p = self.policy
+        window = self._windows.setdefault(ck, deque())
+        window.append((now, ok))
+        while window and window[0][0] < now - p.window_sec:
+            window.popleft()
+        st = self.data.get(ck)
+        if st is None:
+            if ok:
+                return False
+            st = self.data[ck] = CircuitState()
+        changed = False
+        if not ok:
+            st.failures += 1
+            st.last_failure_ts = now
+            changed = True
+        if ck in self._probing:
+            self._probing.discard(ck)
+            if ok:
+                st.disabled = False
+                st.cooldown_sec = 0.0
+                window.clear()
+            else:
+                st.opened_at = now
+                st.cooldown_sec = min(max(st.cooldown_sec, p.cooldown_sec) * 2, p.max_cooldown_sec)
+                st.trips += 1
+            return True
+        if not st.disabled and not ok:
+            failed = sum(1 for _, o in window if not o)
+            if failed >= p.min_failures and failed / len(window) >= p.failure_rate:
+                st.disabled = True
+                st.opened_at = now
+                st.cooldown_sec = p.cooldown_sec
+                st.trips += 1
+        return changed
 
     def reset(self, plugin_key: str):
-        self.data[plugin_key] = CircuitState()
-        self._save()
+        with self._lock:
+            for k in list(self._keys(plugin_key, None)):
+                self.data[k] = CircuitState()
+                self._windows.pop(k, None)
+                self._probing.discard(k)
+                self._dirty.add(k)
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        if self._timer is None:
+            self._timer = threading.Timer(self.flush_interval_sec, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                self._timer = None
+                if not self._dirty:
+                    return
+                changes = {k: asdict(self.data[k]) for k in self._dirty}
+                self._dirty.clear()
+            try:
+                self._persist(changes)
+            except OSError:
+                with self._lock:
+                    self._dirty.update(changes)
+                raise
+
+    def _persist(self, changes: Dict[str, dict]):
+        with file_lock(self.lock_path):
+            merged = self._read_disk()
+            merged.update(changes)
+            self._write_snapshot(merged)
+
+    def _write_snapshot(self, circuits: Dict[str, dict]):
+        atomic_write_text(self.path, json.dumps({"circuits": circuits}, separators=(",", ":")))
+
+    def close(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+        _open_stores.discard(self)
+        self.flush()
+
+    def _flush_at_exit(self):
+        try:
+            self.flush()
+        except OSError:
+            pass
+
+
+class JournalStateStore(StateStore):
+    """``StateStore`` that appends changes to ``data/state.journal``.
+
+    Each flush appends one compact JSON line per changed circuit, holding
+    its full state, so a write costs O(changes) rather than O(circuits).
+    Once the journal grows past ``compact_bytes`` it is folded into the
+    ``data/state.json`` snapshot and truncated. Startup loads the snapshot
+    and replays the journal; records are idempotent, so a crash between
+    writing the snapshot and truncating only means replaying them twice,
+    and a torn last line is skipped.
+    """
+
+    def __init__(self, base_dir: str, policy: Optional[BreakerPolicy] = None, flush_interval_sec: float = 1.0,
+                 compact_bytes: int = 256 * 1024):
+        self.journal_path = Path(base_dir) / "data" / "state.journal"
+        self.compact_bytes = compact_bytes
+        super().__init__(base_dir, policy=policy, flush_interval_sec=flush_interval_sec)
+
+    def _read_disk(self) -> Dict[str, dict]:
+        circuits = super()._read_disk()
+        circuits.update(self._read_journal())
+        return circuits
+
+    def _read_journal(self) -> Dict[str, dict]:
+        changes: Dict[str, dict] = {}
+        try:
+            fh = open(self.journal_path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return changes
+        with fh:
+            for line in fh:
+                try:
+                    rec = json.loads(line)
+                    changes[rec["k"]] = dict(rec["v"])
+                except (ValueError, KeyError, TypeError):
+                    continue
+        return changes
+
+    def _persist(self, changes: Dict[str, dict]):
+        data = "".join(json.dumps({"k": k, "v": v}, separators=(",", ":")) + "\n" for k, v in changes.items())
+        with file_lock(self.lock_path):
+            with open(self.journal_path, "a+b") as fh:
+                # Terminate a line torn by a crash so it can't swallow ours
+                if fh.seek(0, os.SEEK_END):
+                    fh.seek(-1, os.SEEK_END)
+                    if fh.read(1) != b"\n":
+                        data = "\n" + data
+                fh.write(data.encode("utf-8"))
+                fh.flush()
+                os.fsync(fh.fileno())
+                size = fh.tell()
+            if size >= self.compact_bytes:
+                self._compact()
 
-    def is_disabled(self, plugin_key: str) -> bool:
-        return self.data.get(plugin_key, CircuitState()).disabled
+    def compact(self):
+        """Fold the journal into the snapshot now."""
+        with file_lock(self.lock_path):
+            self._compact()
 
+    def _compact(self):
+        # Caller holds the file lock
+        self._write_snapshot(self._read_disk())
+        with open(self.journal_path, "w", encoding="utf-8") as fh:
+            os.fsync(fh.fileno())
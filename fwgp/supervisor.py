@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+from fwgp.async_pipeline import AsyncPipeline
+from fwgp.config import RepoConfig
+from fwgp.dispatcher import Dispatcher
+from fwgp.git_async import AsyncGit
+
+
+class Supervisor:
+    """Runs one ``AsyncPipeline`` per repository on a single event loop.
+
+    All pipelines share one ``Dispatcher`` (and so one plugin thread pool),
+    one ``AsyncGit`` concurrency limit and one bounded executor for watcher
+    polls and hook calls. Those limits queue FIFO, and ``git add`` of a
+    large batch re-queues per chunk, so a huge repo interleaves with the
+    others instead of holding every slot. Plugin circuit breakers are kept
+    per repository, so a plugin failing on one repo keeps running on the rest.
+    """
+
+    def __init__(self, repos: List[RepoConfig], dispatcher: Dispatcher, logger,
+                 make_watcher: Callable[[RepoConfig], object], git_max_concurrency: int = 8,
+                 poll_workers: int = 8, add_chunk_size: int = 1000, **pipeline_kwargs):
+        self.dispatcher = dispatcher
+        dispatcher.circuit_per_repo = True
+        self.logger = logger
+        self.git = AsyncGit(max_concurrency=git_max_concurrency)
+        self.poll_workers = poll_workers
+        self.pipelines: List[AsyncPipeline] = [
+            AsyncPipeline(
+                r.repo_path,
+                dispatcher,
+                logger,
+                git=self.git,
+                watcher=make_watcher(r),
+                remote=r.remote,
+                branch=r.branch,
+                add_chunk_size=add_chunk_size,
+                **pipeline_kwargs,
+            )
+            for r in repos
+        ]
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=self.poll_workers, thread_name_prefix="fwgp-poll")
+        loop.set_default_executor(executor)
+        self.logger.info("Supervising %d repositories", len(self.pipelines))
+        tasks = [asyncio.create_task(p.run(), name=p.repo_path) for p in self.pipelines]
+        try:
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            for p, res in zip(self.pipelines, results):
+                if isinstance(res, Exception):
+                    self.logger.error("Pipeline for %s stopped: %s", p.repo_path, res)
+        finally:
+            executor.shutdown(wait=False)
+
+    def stop(self):
+        for p in self.pipelines:
+            p.stop()
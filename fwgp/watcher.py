@@ -1,19 +1,28 @@
 from __future__ import annotations
 
 import os
+import queue
 import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from fwgp.events import ChangeType, FileDetectedEvent
+from fwgp.fingerprint import FingerprintIndex
+from fwgp.ignore import IgnoreRules
 
 
-def _iter_files(root: str) -> Iterable[Tuple[str, float]]:
+def _iter_files(root: str, ignore: Optional[IgnoreRules] = None) -> Iterable[Tuple[str, float]]:
     for base, dirs, files in os.walk(root):
         # Skip .git directory
         if ".git" in dirs:
             dirs.remove(".git")
+        if ignore is not None:
+            # Prune ignored directories before os.walk descends into them
+            dirs[:] = [d for d in dirs if not ignore.is_ignored(os.path.join(base, d), True)]
         for f in files:
+            if ignore is not None and ignore.is_ignored(os.path.join(base, f)):
+                continue
             p = Path(base) / f
             try:
                 stat = p.stat()
@@ -22,18 +31,39 @@ def _iter_files(root: str) -> Iterable[Tuple[str, float]]:
             yield str(p), stat.st_mtime
 
 
+def _suppress_unchanged(events: List[FileDetectedEvent], fingerprints: Optional[FingerprintIndex]) -> List[FileDetectedEvent]:
+    # Drop MODIFIED events whose content fingerprint did not change
+    # (touch-only writes, save-swap cycles, identical rewrites).
+    if fingerprints is None or not events:
+        return events
+    kept: List[FileDetectedEvent] = []
+    for evt in events:
+        if evt.change_type == ChangeType.DELETED:
+            fingerprints.forget(evt.path)
+        elif not fingerprints.changed(evt.path) and evt.change_type == ChangeType.MODIFIED:
+            continue
+        kept.append(evt)
+    fingerprints.maybe_flush()
+    return kept
+
+
 class PollingWatcher:
-    def __init__(self, root: str, debounce_sec: float = 0.5):
+    def __init__(self, root: str, debounce_sec: float = 0.5, fingerprints: Optional[FingerprintIndex] = None,
+                 ignore: Optional[IgnoreRules] = None):
         self.root = root
         self.debounce_sec = debounce_sec
+        self.fingerprints = fingerprints
+        self.ignore = ignore
         self.snapshot: Dict[str, float] = {}
 
     def initial_scan(self):
-        self.snapshot = {p: m for p, m in _iter_files(self.root)}
+        self.snapshot = {p: m for p, m in _iter_files(self.root, self.ignore)}
 
     def poll_changes(self) -> List[FileDetectedEvent]:
         now = time.time()
-        current = {p: m for p, m in _iter_files(self.root)}
+        if self.ignore is not None:
+            self.ignore.refresh()
+        current = {p: m for p, m in _iter_files(self.root, self.ignore)}
         events: List[FileDetectedEvent] = []
         # detect created/modified
         for p, m in current.items():
@@ -46,11 +76,209 @@ class PollingWatcher:
         for p in set(self.snapshot.keys()) - set(current.keys()):
             events.append(FileDetectedEvent(path=p, change_type=ChangeType.DELETED, ts=now, repo=self.root))
         self.snapshot = current
-        return events
+        return _suppress_unchanged(events, self.fingerprints)
+
+
+@dataclass
+class _DirIndex:
+    mtime_ns: int
+    files: Dict[str, float]  # full path -> mtime
+    subdirs: List[str]  # full paths
+
+
+class IncrementalPollingWatcher:
+    """Polling watcher that keeps a per-directory index between ticks.
+
+    Directories are stat'ed every tick but only re-listed (``os.scandir``)
+    when their own mtime changed, i.e. when entries were added, removed or
+    renamed. Files of unchanged directories are re-stat'ed by their cached
+    path so content modifications are still seen.
+    """
+
+    def __init__(self, root: str, debounce_sec: float = 0.5, fingerprints: Optional[FingerprintIndex] = None,
+                 ignore: Optional[IgnoreRules] = None):
+        self.root = root
+        self.debounce_sec = debounce_sec
+        self.fingerprints = fingerprints
+        self.ignore = ignore
+        self.dirs: Dict[str, _DirIndex] = {}
+
+    def initial_scan(self):
+        self.dirs = {}
+        self._walk(self.root, None, 0.0)
+
+    def poll_changes(self) -> List[FileDetectedEvent]:
+        now = time.time()
+        events: List[FileDetectedEvent] = []
+        if self.ignore is not None and self.ignore.refresh():
+            # Rules or tracked exemptions changed: re-list and re-filter everything
+            for idx in self.dirs.values():
+                idx.mtime_ns = -1
+        self._walk(self.root, events, now)
+        return _suppress_unchanged(events, self.fingerprints)
+
+    def _walk(self, root: str, events: Optional[List[FileDetectedEvent]], now: float):
+        stack = [root]
+        seen = set()
+        while stack:
+            d = stack.pop()
+            seen.add(d)
+            try:
+                dst = os.stat(d)
+            except OSError:
+                continue
+            idx = self.dirs.get(d)
+            if idx is None or idx.mtime_ns != dst.st_mtime_ns:
+                idx = self._rescan_dir(d, dst.st_mtime_ns, idx, events, now)
+                if idx is None:
+                    continue
+                self.dirs[d] = idx
+            else:
+                self._restat_files(idx, events, now)
+            stack.extend(idx.subdirs)
+        # Directories that vanished take their files with them
+        for d in [d for d in self.dirs if d not in seen]:
+            gone = self.dirs.pop(d)
+            if events is not None:
+                for p in gone.files:
+                    events.append(FileDetectedEvent(path=p, change_type=ChangeType.DELETED, ts=now, repo=self.root))
+
+    def _rescan_dir(self, d: str, mtime_ns: int, old: Optional[_DirIndex],
+                    events: Optional[List[FileDetectedEvent]], now: float) -> Optional[_DirIndex]:
+        files: Dict[str, float] = {}
+        subdirs: List[str] = []
+        ignore = self.ignore
+        try:
+            with os.scandir(d) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name != ".git" and not (ignore and ignore.is_ignored(entry.path, True)):
+                                subdirs.append(entry.path)
+                            continue
+                        if ignore and ignore.is_ignored(entry.path):
+                            continue
+                        files[entry.path] = entry.stat().st_mtime
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+        if events is not None:
+            prev = old.files if old is not None else {}
+            for p, m in files.items():
+                o = prev.get(p)
+                if o is None:
+                    events.append(FileDetectedEvent(path=p, change_type=ChangeType.CREATED, ts=now, repo=self.root))
+                elif m != o and m - o >= self.debounce_sec:
+                    events.append(FileDetectedEvent(path=p, change_type=ChangeType.MODIFIED, ts=now, repo=self.root))
+            for p in prev:
+                if p not in files:
+                    events.append(FileDetectedEvent(path=p, change_type=ChangeType.DELETED, ts=now, repo=self.root))
+        return _DirIndex(mtime_ns=mtime_ns, files=files, subdirs=subdirs)
+
+    def _restat_files(self, idx: _DirIndex, events: List[FileDetectedEvent], now: float):
+        files = idx.files
+        for p, o in files.items():
+            try:
+                m = os.stat(p).st_mtime
+            except OSError:
+                # Removal always bumps the parent mtime; pick it up next tick
+                continue
+            if m != o and m - o >= self.debounce_sec:
+                files[p] = m
+                events.append(FileDetectedEvent(path=p, change_type=ChangeType.MODIFIED, ts=now, repo=self.root))
+
+
+# (pending, incoming) -> merged change type; None drops the path entirely
+_MERGE = {
+    (ChangeType.CREATED, ChangeType.CREATED): ChangeType.CREATED,
+    (ChangeType.CREATED, ChangeType.MODIFIED): ChangeType.CREATED,
+    (ChangeType.CREATED, ChangeType.DELETED): None,
+    (ChangeType.MODIFIED, ChangeType.CREATED): ChangeType.MODIFIED,
+    (ChangeType.MODIFIED, ChangeType.MODIFIED): ChangeType.MODIFIED,
+    (ChangeType.MODIFIED, ChangeType.DELETED): ChangeType.DELETED,
+    (ChangeType.DELETED, ChangeType.CREATED): ChangeType.MODIFIED,
+    (ChangeType.DELETED, ChangeType.MODIFIED): ChangeType.MODIFIED,
+    (ChangeType.DELETED, ChangeType.DELETED): ChangeType.DELETED,
+}
+
+
+class EventCoalescer:
+    """Per-path event buffer released as one batch after a quiet period.
+
+    The batch is also released ``max_wait_sec`` after its first event, so a
+    steady stream of writes cannot hold it back indefinitely.
+
+    When more than ``max_pending`` distinct paths accumulate (or the producer
+    reports lost events via ``mark_overflow``), the buffer is dropped and
+    ``drain`` returns the wall-clock time of the first lost event instead, so
+    the caller can fall back to one rescan. Not thread-safe: owned by the
+    consuming thread.
+    """
+
+    def __init__(self, quiet_sec: float = 0.2, max_pending: int = 10000, max_wait_sec: float = 2.0):
+        self.quiet_sec = quiet_sec
+        self.max_wait_sec = max_wait_sec
+        self.max_pending = max_pending
+        self.overflow_count = 0
+        self._pending: Dict[str, FileDetectedEvent] = {}
+        self._first_ts: Optional[float] = None
+        self._last_ts = 0.0
+        self._overflow_since: Optional[float] = None
+
+    def add(self, evt: FileDetectedEvent) -> None:
+        self._last_ts = max(self._last_ts, evt.ts)
+        if self._first_ts is None:
+            self._first_ts = evt.ts
+        if self._overflow_since is not None:
+            return
+        old = self._pending.get(evt.path)
+        if old is None:
+            if len(self._pending) >= self.max_pending:
+                self.mark_overflow(self._first_ts)
+                return
+            self._pending[evt.path] = evt
+            return
+        merged = _MERGE[(old.change_type, evt.change_type)]
+        if merged is None:
+            del self._pending[evt.path]
+        else:
+            self._pending[evt.path] = FileDetectedEvent(evt.path, merged, evt.ts, evt.repo)
+
+    def mark_overflow(self, since: float) -> None:
+        if self._overflow_since is None:
+            self.overflow_count += 1
+            self._overflow_since = since
+        else:
+            self._overflow_since = min(self._overflow_since, since)
+        self._last_ts = max(self._last_ts, since)
+        self._pending.clear()
+
+    def has_pending(self) -> bool:
+        return bool(self._pending) or self._overflow_since is not None
+
+    def quiet_remaining(self) -> float:
+        due = self._last_ts + self.quiet_sec
+        if self._first_ts is not None:
+            due = min(due, self._first_ts + self.max_wait_sec)
+        return max(0.0, due - time.time())
+
+    def ready(self) -> bool:
+        return self.has_pending() and self.quiet_remaining() <= 0.0
+
+    def drain(self) -> Tuple[List[FileDetectedEvent], Optional[float]]:
+        evts = list(self._pending.values())
+        since = self._overflow_since
+        self._pending.clear()
+        self._first_ts = None
+        self._overflow_since = None
+        return evts, since
 
 
 class WatchdogWatcher:
-    def __init__(self, root: str):
+    def __init__(self, root: str, fingerprints: Optional[FingerprintIndex] = None,
+                 ignore: Optional[IgnoreRules] = None, quiet_sec: float = 0.2, max_pending: int = 10000,
+                 max_wait_sec: float = 2.0):
         try:
             from watchdog.observers import Observer  # type: ignore
             from watchdog.events import FileSystemEventHandler  # type: ignore
@@ -58,11 +286,20 @@ class WatchdogWatcher:
             raise ImportError("watchdog not installed") from e
 
         self.root = root
+        self.fingerprints = fingerprints
+        self.ignore = ignore
         self._observer = Observer()
-        self._events: List[FileDetectedEvent] = []
+        # Observer thread -> consumer hand-off. The coalescing buffer itself is
+        # only touched by the thread calling poll/wait.
+        self._queue: "queue.Queue[FileDetectedEvent]" = queue.Queue(maxsize=max_pending)
+        self._lost_since: Optional[float] = None
+        self._buffer = EventCoalescer(quiet_sec=quiet_sec, max_pending=max_pending, max_wait_sec=max_wait_sec)
         self._handler = self._make_handler()
         self._observer.schedule(self._handler, root, recursive=True)
         self._observer.start()
+        # Files reported so far, so a rescan after lost events can tell
+        # which of them were deleted meanwhile
+        self._known: Set[str] = {p for p, _ in _iter_files(root, ignore)}
 
     def _make_handler(self):
         from watchdog.events import FileSystemEventHandler  # type: ignore
@@ -72,40 +309,123 @@ class WatchdogWatcher:
                 self.outer = outer
 
             def on_created(self, event):
-                if event.is_directory or ".git" in event.src_path:
-                    return
-                self.outer._events.append(
-                    FileDetectedEvent(event.src_path, ChangeType.CREATED, time.time(), self.outer.root)
-                )
+                if not event.is_directory:
+                    self.outer._emit(event.src_path, ChangeType.CREATED)
 
             def on_modified(self, event):
-                if event.is_directory or ".git" in event.src_path:
-                    return
-                self.outer._events.append(
-                    FileDetectedEvent(event.src_path, ChangeType.MODIFIED, time.time(), self.outer.root)
-                )
+                if not event.is_directory:
+                    self.outer._emit(event.src_path, ChangeType.MODIFIED)
 
             def on_deleted(self, event):
-                if event.is_directory or ".git" in event.src_path:
-                    return
-                self.outer._events.append(
-                    FileDetectedEvent(event.src_path, ChangeType.DELETED, time.time(), self.outer.root)
-                )
+                if not event.is_directory:
+                    self.outer._emit(event.src_path, ChangeType.DELETED)
+
+            def on_moved(self, event):
+                # Save-swap writes arrive as a rename onto the target path
+                if not event.is_directory:
+                    self.outer._emit(event.src_path, ChangeType.DELETED)
+                    self.outer._emit(event.dest_path, ChangeType.CREATED)
 
         return Handler(self)
 
-    def poll_changes(self) -> List[FileDetectedEvent]:
-        evts = list(self._events)
-        self._events.clear()
+    def _skip(self, path: str) -> bool:
+        # Runs on the observer thread for every event; the rules are
+        # refreshed once per tick by poll_changes
+        if ".git" in path:
+            return True
+        ignore = self.ignore
+        return ignore is not None and ignore.is_ignored_tree(path)
+
+    def _emit(self, path: str, change_type: ChangeType) -> None:
+        if self._skip(path):
+            return
+        evt = FileDetectedEvent(path, change_type, time.time(), self.root)
+        try:
+            self._queue.put_nowait(evt)
+        except queue.Full:
+            if self._lost_since is None:
+                self._lost_since = evt.ts
+
+    def _pump(self) -> None:
+        while True:
+            try:
+                self._buffer.add(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        since = self._lost_since
+        if since is not None:
+            self._lost_since = None
+            self._buffer.mark_overflow(since)
+
+    def wait_for_changes(self, timeout: float) -> bool:
+        """Block until a coalesced batch is ready or ``timeout`` elapses."""
+        deadline = time.monotonic() + timeout
+        while True:
+            self._pump()
+            if self._buffer.ready():
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            if self._buffer.has_pending():
+                remaining = min(remaining, max(self._buffer.quiet_remaining(), 0.01))
+            try:
+                self._buffer.add(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                pass
+
+    @property
+    def overflow_count(self) -> int:
+        return self._buffer.overflow_count
+
+    def _track(self, evts: List[FileDetectedEvent]) -> None:
+        for evt in evts:
+            if evt.change_type == ChangeType.DELETED:
+                self._known.discard(evt.path)
+            else:
+                self._known.add(evt.path)
+
+    def _rescan(self, since: float) -> List[FileDetectedEvent]:
+        # Events were lost: diff against the known files for creations and
+        # deletions, and report every file touched since the first lost
+        # event. Allow for coarse filesystem timestamp granularity.
+        now = time.time()
+        current = dict(_iter_files(self.root, self.ignore))
+        evts: List[FileDetectedEvent] = []
+        for p, m in current.items():
+            if p not in self._known:
+                evts.append(FileDetectedEvent(path=p, change_type=ChangeType.CREATED, ts=now, repo=self.root))
+            elif m >= since - 2.0:
+                evts.append(FileDetectedEvent(path=p, change_type=ChangeType.MODIFIED, ts=now, repo=self.root))
+        for p in self._known.difference(current):
+            evts.append(FileDetectedEvent(path=p, change_type=ChangeType.DELETED, ts=now, repo=self.root))
+        self._known = set(current)
         return evts
 
+    def poll_changes(self) -> List[FileDetectedEvent]:
+        if self.ignore is not None:
+            self.ignore.refresh()
+        self._pump()
+        if not self._buffer.ready():
+            return []
+        evts, overflow_since = self._buffer.drain()
+        if overflow_since is not None:
+            evts = self._rescan(overflow_since)
+        else:
+            self._track(evts)
+        return _suppress_unchanged(evts, self.fingerprints)
+
 
-def get_watcher(root: str, prefer_os_events: bool = True):
+def get_watcher(root: str, prefer_os_events: bool = True, incremental: bool = False,
+                fingerprints: Optional[FingerprintIndex] = None, ignore: Optional[IgnoreRules] = None,
+                quiet_sec: float = 0.2, max_pending: int = 10000, max_wait_sec: float = 2.0):
     if prefer_os_events:
         try:
-            return WatchdogWatcher(root)
+            return WatchdogWatcher(root, fingerprints=fingerprints, ignore=ignore,
+                                   quiet_sec=quiet_sec, max_pending=max_pending, max_wait_sec=max_wait_sec)
         except Exception:
             pass
-    w = PollingWatcher(root)
+    cls = IncrementalPollingWatcher if incremental else PollingWatcher
+    w = cls(root, fingerprints=fingerprints, ignore=ignore)
     w.initial_scan()
     return w
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""
+bench_watcher.py
+
+Measures the per-tick cost of the polling watchers on a synthetic tree.
+For each size it builds a temporary directory of N files (100 per
+directory), runs an initial scan, touches a handful of files and then
+times idle and dirty ticks for ``PollingWatcher`` and
+``IncrementalPollingWatcher``.
+
+Usage:
+    python scripts/bench_watcher.py [N ...]   (default: 10000 100000 500000)
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fwgp.watcher import IncrementalPollingWatcher, PollingWatcher  # noqa: E402
+
+FILES_PER_DIR = 100
+TICKS = 5
+
+
+def build_tree(root: str, n: int) -> list:
+    paths = []
+    for i in range(n):
+        d = os.path.join(root, f"d{i // (FILES_PER_DIR * FILES_PER_DIR)}", f"s{i // FILES_PER_DIR}")
+        if i % FILES_PER_DIR == 0:
+            os.makedirs(d, exist_ok=True)
+        p = os.path.join(d, f"f{i}.txt")
+        with open(p, "w") as fh:
+            fh.write("x")
+        paths.append(p)
+    return paths
+
+
+def time_ticks(watcher, touch=None) -> float:
+    best = float("inf")
+    for i in range(TICKS):
+        if touch:
+            future = time.time() + 10 * (i + 1)
+            for p in touch:
+                os.utime(p, (future, future))
+        t0 = time.perf_counter()
+        watcher.poll_changes()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench(n: int) -> None:
+    with tempfile.TemporaryDirectory() as root:
+        t0 = time.perf_counter()
+        paths = build_tree(root, n)
+        print(f"\n{n} files (tree built in {time.perf_counter() - t0:.1f}s)")
+        touch = paths[:: max(1, n // 10)]
+        for cls in (PollingWatcher, IncrementalPollingWatcher):
+            w = cls(root)
+            w.initial_scan()
+            idle = time_ticks(w)
+            dirty = time_ticks(w, touch)
+            print(f"  {cls.__name__:28} idle {idle * 1000:9.1f} ms   dirty {dirty * 1000:9.1f} ms")
+
+
+def main(argv):
+    sizes = [int(a) for a in argv] or [10_000, 100_000, 500_000]
+    for n in sizes:
+        bench(n)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import os
 import sys
 from pathlib import Path
@@ -8,9 +9,14 @@ from fwgp.config import Config, load_config, save_config
 from fwgp.dispatcher import Dispatcher
 from fwgp.git_adapter import GitError, checkout_branch, init_repo, is_repo, set_remote
 from fwgp.logger import setup_logger
-from fwgp.pipeline import Pipeline
-from fwgp.state import StateStore
+from fwgp.metrics import PluginMetrics
+from fwgp.pipeline import BatchPolicy, Pipeline
+from fwgp.policy import load_performance_policy
+from fwgp.state import JournalStateStore, StateStore
+from fwgp.supervisor import Supervisor
 from fwgp.discovery import discover_plugins
+from fwgp.fingerprint import FingerprintIndex
+from fwgp.ignore import IgnoreRules
 from fwgp.watcher import get_watcher
 
 
@@ -86,28 +92,92 @@ def select_plugins(cfg: Config, available: list[str]):
         print("Invalid input, keeping existing selection.")
 
 
+def _make_watcher(cfg: Config, repo_path: str, fingerprints):
+    return get_watcher(
+        repo_path,
+        prefer_os_events=True,
+        incremental=cfg.incremental_polling,
+        fingerprints=fingerprints,
+        ignore=IgnoreRules(repo_path) if cfg.respect_gitignore else None,
+        quiet_sec=cfg.event_quiet_sec,
+        max_pending=cfg.event_max_pending,
+        max_wait_sec=cfg.event_max_wait_sec,
+    )
+
+
+def _pipeline_options(cfg: Config) -> dict:
+    return dict(
+        interval_sec=cfg.polling_interval_sec,
+        sync_interval_sec=cfg.sync_interval_sec,
+        max_sync_interval_sec=cfg.max_sync_interval_sec,
+        batch_policy=BatchPolicy(
+            max_wait_sec=cfg.batch_max_wait_sec,
+            max_files=cfg.batch_max_files,
+            max_bytes=cfg.batch_max_bytes,
+        ),
+    )
+
+
 def run_pipeline(cfg: Config):
     logger = setup_logger(os.getcwd())
-    state = StateStore(os.getcwd())
-    disp = Dispatcher(state, logger, timeout_sec=2.0)
-    disp.load_plugins(cfg.enabled_plugins)
-    watcher = get_watcher(cfg.repo_path, prefer_os_events=True)
-    pipe = Pipeline(cfg.repo_path, disp, logger, interval_sec=cfg.polling_interval_sec, watcher=watcher)
-
-    # Inject remote/branch context into pipeline's ctx by wrapping _ctx
-    orig_ctx = pipe._ctx
-    def ctx_wrapper():
-        c = orig_ctx()
-        c["remote"] = cfg.remote
-        c["branch"] = cfg.branch
-        return c
-    pipe._ctx = ctx_wrapper  # type: ignore
+    state = JournalStateStore(os.getcwd()) if cfg.state_backend == "journal" else StateStore(os.getcwd())
+    policy = load_performance_policy(os.path.join(os.getcwd(), "policy", "performance.yml"))
+    disp = Dispatcher(state, logger, max_workers=cfg.dispatcher_workers, notify_queue_size=cfg.notify_queue_size,
+                      isolation=cfg.plugin_isolation, metrics=PluginMetrics(os.getcwd()), policy=policy)
+    budgets = {}
+    discover_plugins("plugins", logger, budgets=budgets)
+    disp.load_plugins(cfg.enabled_plugins, budgets=budgets)
+    fingerprints = FingerprintIndex(os.getcwd()) if cfg.content_fingerprints else None
+    if cfg.repositories:
+        try:
+            run_supervisor(cfg, disp, logger, fingerprints)
+        finally:
+            disp.close_plugins()
+            disp.metrics.flush()
+            state.close()
+        return
+    pipe = Pipeline(
+        cfg.repo_path,
+        disp,
+        logger,
+        watcher=_make_watcher(cfg, cfg.repo_path, fingerprints),
+        persistent_git=cfg.persistent_git,
+        remote=cfg.remote,
+        branch=cfg.branch,
+        **_pipeline_options(cfg),
+    )
 
     print("Starting watcher. Press Ctrl+C to stop.")
     try:
         pipe.start()
     except KeyboardInterrupt:
         print("Stopped.")
+    finally:
+        disp.close_plugins()
+        disp.metrics.flush()
+        state.close()
+        if fingerprints is not None:
+            fingerprints.flush()
+
+
+def run_supervisor(cfg: Config, disp: Dispatcher, logger, fingerprints):
+    sup = Supervisor(
+        cfg.repositories,
+        disp,
+        logger,
+        make_watcher=lambda r: _make_watcher(cfg, r.repo_path, fingerprints),
+        git_max_concurrency=cfg.git_max_concurrency,
+        poll_workers=cfg.poll_workers,
+        **_pipeline_options(cfg),
+    )
+    print(f"Supervising {len(cfg.repositories)} repositories. Press Ctrl+C to stop.")
+    try:
+        asyncio.run(sup.run())
+    except KeyboardInterrupt:
+        print("Stopped.")
+    finally:
+        if fingerprints is not None:
+            fingerprints.flush()
 
 
 def main():
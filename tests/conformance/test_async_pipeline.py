@@ -0,0 +1,82 @@
+import asyncio
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import unittest
+
+from fwgp import events
+from fwgp.async_pipeline import AsyncPipeline
+from fwgp.dispatcher import Dispatcher
+from fwgp.git_async import AsyncGit
+from fwgp.state import StateStore
+
+
+class DummyLogger:
+    def info(self, *a, **k):
+        pass
+    def warning(self, *a, **k):
+        pass
+    def error(self, *a, **k):
+        pass
+
+
+def git(cwd, *args):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+class OneShotWatcher:
+    def __init__(self, changes):
+        self.changes = changes
+
+    def poll_changes(self):
+        changes, self.changes = self.changes, []
+        return changes
+
+
+class TestAsyncPipeline(unittest.TestCase):
+    def setUp(self):
+        self.base = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.base, ignore_errors=True)
+
+    def _repo(self, name):
+        repo = os.path.join(self.base, name)
+        os.makedirs(repo)
+        git(repo, "init", "-q")
+        git(repo, "config", "user.email", "t@example.com")
+        git(repo, "config", "user.name", "t")
+        path = os.path.join(repo, "a.txt")
+        with open(path, "w") as fh:
+            fh.write(name)
+        evt = events.FileDetectedEvent(path, events.ChangeType.CREATED, time.time(), repo)
+        return repo, OneShotWatcher([evt])
+
+    def test_drives_several_repos_on_one_loop(self):
+        shared = AsyncGit(max_concurrency=2)
+        disp = Dispatcher(StateStore(self.base), DummyLogger())
+        pipes = []
+        for i in range(4):
+            repo, watcher = self._repo("r%d" % i)
+            pipes.append(AsyncPipeline(repo, disp, DummyLogger(), git=shared, interval_sec=0.05, watcher=watcher))
+
+        async def main():
+            tasks = [asyncio.create_task(p.run()) for p in pipes]
+            await asyncio.sleep(1.0)
+            for p in pipes:
+                p.stop()
+            await asyncio.wait_for(asyncio.gather(*tasks), 5)
+
+        asyncio.run(main())
+        for p in pipes:
+            # Threaded-only machinery is not inherited
+            for name in ("remote_sync", "status", "start", "_tick"):
+                self.assertFalse(hasattr(p, name), name)
+            self.assertEqual(git(p.repo_path, "log", "--format=%s"), "chore(auto): update files")
+            self.assertEqual(git(p.repo_path, "show", "HEAD:a.txt"), os.path.basename(p.repo_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -35,6 +35,8 @@ class TestDispatcherCircuit(unittest.TestCase):
         # Trigger three timeouts
         for _ in range(3):
             disp.on_file_detected(type("E", (), {"path":"p","change_type":"created","ts":0,"repo":"r"})(), {})
+        # Notifications are delivered asynchronously
+        self.assertTrue(disp.drain_notifications(timeout=2))
         self.assertTrue(state.is_disabled(key))
 
 
@@ -0,0 +1,195 @@
+import tempfile
+import threading
+import time
+import unittest
+
+from fwgp import events
+from fwgp.dispatcher import Dispatcher, LoadedPlugin, NotificationQueue
+from fwgp.plugins.base import BasePlugin
+from fwgp.state import StateStore
+
+
+class DummyLogger:
+    def __init__(self):
+        self.errors = []
+    def info(self, *a, **k):
+        pass
+    def warning(self, *a, **k):
+        pass
+    def error(self, *a, **k):
+        self.errors.append(a[0] % a[1:])
+
+
+class SlowCommit:
+    def __init__(self, delay, message, allow=True):
+        self.delay = delay
+        self.message = message
+        self.allow = allow
+
+    def beforeCommit(self, req, ctx):
+        time.sleep(self.delay)
+        return events.CommitDecision(allow=self.allow, message_override=self.message)
+
+
+class SlowListener:
+    def __init__(self):
+        self.seen = []
+        self.release = threading.Event()
+
+    def afterCommit(self, sha, ctx):
+        self.release.wait(2)
+        self.seen.append(sha)
+
+
+class PerEvent(BasePlugin):
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def onFileDetected(self, evt, ctx):
+        self.calls.append(evt)
+
+
+class Batched(PerEvent):
+    def onFilesDetected(self, evts, ctx):
+        self.calls.append(list(evts))
+
+
+class TestDispatcherFanout(unittest.TestCase):
+    def _dispatcher(self, plugins, timeout_sec=2.0):
+        disp = Dispatcher(StateStore(tempfile.mkdtemp()), DummyLogger(), timeout_sec=timeout_sec)
+        disp.plugins = [LoadedPlugin(key="p%d" % i, instance=inst) for i, inst in enumerate(plugins)]
+        return disp
+
+    def test_decision_hooks_run_concurrently_and_merge_in_order(self):
+        # The slowest plugin is first; its override must still lose to later plugins
+        disp = self._dispatcher([SlowCommit(0.3, "first"), SlowCommit(0.2, "second"), SlowCommit(0.1, None)])
+        req = events.CommitRequest(staged_summary=["a"], repo="r")
+        started = time.monotonic()
+        allow, message, sign = disp.before_commit(req, {})
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertTrue(allow)
+        self.assertEqual(message, "second")
+
+    def test_single_deadline_covers_all_plugins(self):
+        disp = self._dispatcher([SlowCommit(0.5, "slow"), SlowCommit(0.5, "slow", allow=False), SlowCommit(0.0, "fast")],
+                                timeout_sec=0.2)
+        started = time.monotonic()
+        allow, message, _ = disp.before_commit(events.CommitRequest(staged_summary=[], repo="r"), {})
+        self.assertLess(time.monotonic() - started, 0.4)
+        self.assertTrue(allow)
+        self.assertEqual(message, "fast")
+        self.assertEqual(disp.state.circuit("p0", "beforeCommit").failures, 1)
+        self.assertEqual(disp.state.circuit("p1", "beforeCommit").failures, 1)
+
+    def test_busy_plugin_is_skipped_without_delaying_others(self):
+        disp = self._dispatcher([SlowCommit(1.0, "hung"), SlowCommit(0.1, None, allow=False)], timeout_sec=0.3)
+        disp._budgets["p0"] = disp.budget_for({"max_concurrency": 1})
+        req = events.CommitRequest(staged_summary=[], repo="r")
+        disp.before_commit(req, {})
+        # p0 still holds its only slot; p1's veto must survive the second round
+        allow, _, _ = disp.before_commit(req, {})
+        self.assertFalse(allow)
+        self.assertEqual(disp.state.circuit("p0", "beforeCommit").failures, 1)
+        self.assertEqual(disp.state.circuit("p1", "beforeCommit").failures, 0)
+
+    def test_each_call_sees_its_deadline(self):
+        seen = []
+
+        class Recorder:
+            def beforeCommit(self, req, ctx):
+                seen.append(ctx)
+
+        disp = self._dispatcher([Recorder()], timeout_sec=0.5)
+        ctx = {"repo_path": "r"}
+        started = time.monotonic()
+        disp.before_commit(events.CommitRequest(staged_summary=[], repo="r"), ctx)
+        self.assertEqual(seen[0]["repo_path"], "r")
+        self.assertAlmostEqual(seen[0]["hook_deadline"], started + 0.5, delta=0.1)
+        self.assertNotIn("hook_deadline", ctx)
+
+    def test_notifications_do_not_block_and_drop_oldest(self):
+        listener = SlowListener()
+        disp = self._dispatcher([listener])
+        disp.notify_queue_size = 2
+        started = time.monotonic()
+        disp.after_commit("a", {})
+        while disp.notification_stats()["p0"]["depth"]:
+            time.sleep(0.01)
+        for sha in ("b", "c", "d"):
+            disp.after_commit(sha, {})
+        self.assertLess(time.monotonic() - started, 0.2)
+        stats = disp.notification_stats()["p0"]
+        # "a" is in flight; "b" was pushed out by "d"
+        self.assertEqual(stats, {"depth": 2, "dropped": 1})
+        listener.release.set()
+        self.assertTrue(disp.drain_notifications(timeout=2))
+        self.assertEqual(listener.seen, ["a", "c", "d"])
+
+    def test_close_plugins_drains_and_stops_queues(self):
+        listener = SlowListener()
+        listener.release.set()
+        disp = self._dispatcher([listener])
+        for sha in ("a", "b", "c"):
+            disp.after_commit(sha, {})
+        queue = disp._queues["p0"]
+        disp.close_plugins()
+        self.assertEqual(listener.seen, ["a", "b", "c"])
+        self.assertFalse(queue._thread.is_alive())
+        self.assertEqual(disp.notification_stats(), {})
+
+    def test_queue_logs_delivery_errors(self):
+        logger = DummyLogger()
+
+        def deliver(method, args):
+            raise RuntimeError("pool closed")
+        queue = NotificationQueue(deliver, 10, "q", logger=logger)
+        queue.put("afterCommit", ())
+        self.assertTrue(queue.close(timeout=2))
+        self.assertEqual(logger.errors, ["Notification afterCommit on q failed: pool closed"])
+
+    def test_hung_listener_does_not_starve_decision_hooks(self):
+        class Hung:
+            def __init__(self):
+                self.active = self.peak = 0
+                self.lock = threading.Lock()
+                self.release = threading.Event()
+
+            def afterCommit(self, sha, ctx):
+                with self.lock:
+                    self.active += 1
+                    self.peak = max(self.peak, self.active)
+                self.release.wait(5)
+                with self.lock:
+                    self.active -= 1
+
+        hung = Hung()
+        disp = Dispatcher(StateStore(tempfile.mkdtemp()), DummyLogger(), timeout_sec=0.1, max_workers=2)
+        disp.plugins = [LoadedPlugin(key="p0", instance=hung), LoadedPlugin(key="p1", instance=SlowCommit(0.0, "ok"))]
+        for i in range(5):
+            disp.after_commit(str(i), {})
+        time.sleep(0.5)
+        _, message, _ = disp.before_commit(events.CommitRequest(staged_summary=[], repo="r"), {})
+        self.assertEqual(message, "ok")
+        self.assertEqual(hung.peak, 1)
+        hung.release.set()
+        self.assertTrue(disp.drain_notifications(timeout=5))
+
+    def test_files_detected_batches_with_per_event_fallback(self):
+        per_event, batched = PerEvent(), Batched()
+        disp = self._dispatcher([per_event, batched])
+        evts = ["e1", "e2", "e3"]
+        disp.on_files_detected(evts, {})
+        self.assertTrue(disp.drain_notifications(timeout=2))
+        self.assertEqual(per_event.calls, evts)
+        self.assertEqual(batched.calls, [evts])
+
+    def test_plugin_without_detection_hooks_gets_nothing(self):
+        disp = self._dispatcher([BasePlugin()])
+        disp.on_files_detected(["e%d" % i for i in range(100)], {})
+        disp.after_commit("sha", {})
+        self.assertEqual(disp.notification_stats(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from fwgp.events import ChangeType, FileDetectedEvent
+from fwgp.watcher import EventCoalescer, WatchdogWatcher
+
+C, M, D = ChangeType.CREATED, ChangeType.MODIFIED, ChangeType.DELETED
+
+
+def _evt(path, kind):
+    return FileDetectedEvent(path, kind, time.time(), "r")
+
+
+class TestEventCoalescer(unittest.TestCase):
+    def _drain(self, seq, **kw):
+        buf = EventCoalescer(quiet_sec=0.0, **kw)
+        for path, kind in seq:
+            buf.add(_evt(path, kind))
+        return buf, buf.drain()
+
+    def test_merges_sequences_per_path(self):
+        _, (evts, since) = self._drain([
+            ("a", C), ("a", M), ("a", M),
+            ("b", C), ("b", D),
+            ("c", M), ("c", D),
+            ("d", D), ("d", C),
+        ])
+        self.assertIsNone(since)
+        self.assertEqual([(e.path, e.change_type) for e in evts], [("a", C), ("c", D), ("d", M)])
+
+    def test_waits_for_quiet_period(self):
+        buf = EventCoalescer(quiet_sec=0.2)
+        self.assertFalse(buf.ready())
+        buf.add(_evt("a", M))
+        self.assertFalse(buf.ready())
+        time.sleep(0.25)
+        self.assertTrue(buf.ready())
+
+    def test_continuous_writes_flush_after_max_wait(self):
+        buf = EventCoalescer(quiet_sec=0.2, max_wait_sec=0.3)
+        started = time.monotonic()
+        while not buf.ready() and time.monotonic() - started < 2:
+            buf.add(_evt("a", M))
+            time.sleep(0.05)
+        self.assertTrue(buf.ready())
+        self.assertLess(time.monotonic() - started, 0.6)
+
+    def test_overflow_signals_rescan(self):
+        buf, (evts, since) = self._drain([(str(i), M) for i in range(5)], max_pending=3)
+        self.assertEqual(evts, [])
+        self.assertIsNotNone(since)
+        self.assertEqual(buf.overflow_count, 1)
+
+
+def _bare_watchdog_watcher(max_pending=100):
+    # WatchdogWatcher without an observer (watchdog may not be installed)
+    w = WatchdogWatcher.__new__(WatchdogWatcher)
+    w.root, w.fingerprints, w.ignore = "/r", None, None
+    w._queue = queue.Queue(maxsize=max_pending)
+    w._lost_since = None
+    w._known = set()
+    w._buffer = EventCoalescer(quiet_sec=0.05, max_pending=max_pending)
+    return w
+
+
+class TestWatchdogQueue(unittest.TestCase):
+    def test_wait_wakes_when_events_arrive(self):
+        w = _bare_watchdog_watcher()
+        threading.Timer(0.1, w._emit, args=("/r/a", M)).start()
+        t0 = time.monotonic()
+        self.assertTrue(w.wait_for_changes(5.0))
+        self.assertLess(time.monotonic() - t0, 1.0)
+        self.assertEqual([e.path for e in w.poll_changes()], ["/r/a"])
+        self.assertFalse(w.wait_for_changes(0.05))
+
+    def test_full_queue_is_reported_as_overflow(self):
+        w = _bare_watchdog_watcher(max_pending=2)
+        w._rescan = lambda since: ["rescanned"]
+        for i in range(4):
+            w._emit(f"/r/{i}", M)
+        self.assertTrue(w.wait_for_changes(1.0))
+        self.assertEqual(w.poll_changes(), ["rescanned"])
+        self.assertEqual(w.overflow_count, 1)
+
+    def test_rescan_reports_deletions_and_creations(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, True)
+        paths = {name: os.path.join(root, name) for name in ("old", "gone", "new")}
+        for name in ("old", "gone"):
+            with open(paths[name], "w") as fh:
+                fh.write(name)
+        os.utime(paths["old"], (0, 0))
+        w = _bare_watchdog_watcher()
+        w.root = root
+        w._track([_evt(paths["old"], C), _evt(paths["gone"], C)])
+        os.unlink(paths["gone"])
+        with open(paths["new"], "w") as fh:
+            fh.write("new")
+        evts = {(e.path, e.change_type) for e in w._rescan(time.time())}
+        self.assertEqual(evts, {(paths["gone"], D), (paths["new"], C)})
+        self.assertEqual(w._known, {paths["old"], paths["new"]})
+
+    def test_ignore_rules_refresh_once_per_tick(self):
+        class CountingRules:
+            refreshes = 0
+
+            def refresh(self):
+                self.refreshes += 1
+                return False
+
+            def is_ignored_tree(self, path, is_dir=False):
+                return False
+
+        w = _bare_watchdog_watcher()
+        w.ignore = CountingRules()
+        for i in range(50):
+            w._emit(f"/r/{i}", M)
+        self.assertEqual(w.ignore.refreshes, 0)
+        self.assertTrue(w.wait_for_changes(1.0))
+        self.assertEqual(len(w.poll_changes()), 50)
+        self.assertEqual(w.ignore.refreshes, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from fwgp.events import ChangeType
+from fwgp.fingerprint import FingerprintIndex
+from fwgp.watcher import PollingWatcher
+
+
+class TestFingerprintIndex(unittest.TestCase):
+    def setUp(self):
+        self.base = tempfile.mkdtemp()
+        self.root = os.path.join(self.base, "repo")
+        os.makedirs(self.root)
+        self.file = os.path.join(self.root, "a.txt")
+        with open(self.file, "w") as fh:
+            fh.write("hello")
+
+    def tearDown(self):
+        shutil.rmtree(self.base, ignore_errors=True)
+
+    def _bump_mtime(self, offset):
+        t = time.time() + offset
+        os.utime(self.file, (t, t))
+
+    def test_touch_only_write_is_suppressed(self):
+        fp = FingerprintIndex(self.base)
+        self.assertTrue(fp.changed(self.file))
+        w = PollingWatcher(self.root, fingerprints=fp)
+        w.initial_scan()
+        self._bump_mtime(10)
+        self.assertEqual(w.poll_changes(), [])
+        with open(self.file, "w") as fh:
+            fh.write("world")
+        self._bump_mtime(20)
+        self.assertEqual([e.change_type for e in w.poll_changes()], [ChangeType.MODIFIED])
+
+    def test_index_survives_restart(self):
+        fp = FingerprintIndex(self.base)
+        fp.changed(self.file)
+        fp.flush()
+        self._bump_mtime(10)
+        self.assertFalse(FingerprintIndex(self.base).changed(self.file))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from fwgp import git_adapter
+
+
+def git(cwd, *args):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+class TestChunkedAdd(unittest.TestCase):
+    def setUp(self):
+        self.repo = tempfile.mkdtemp()
+        git(self.repo, "init", "-q")
+
+    def tearDown(self):
+        shutil.rmtree(self.repo, ignore_errors=True)
+
+    def test_stages_in_chunks_including_awkward_names(self):
+        names = ["f%d.txt" % i for i in range(25)] + ["with space.txt", "-dash.txt"]
+        for name in names:
+            with open(os.path.join(self.repo, name), "w") as fh:
+                fh.write(name)
+        timings = git_adapter.add(self.repo, names, chunk_size=10)
+        self.assertEqual([n for n, _ in timings], [10, 10, 7])
+        self.assertEqual(sorted(git_adapter.staged_summary(self.repo)), sorted(names))
+
+    def test_empty_is_noop(self):
+        self.assertEqual(git_adapter.add(self.repo, []), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from fwgp import git_adapter
+
+
+def git(cwd, *args):
+    return subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True).stdout.strip()
+
+
+class TestGitStatus(unittest.TestCase):
+    def setUp(self):
+        self.repo = tempfile.mkdtemp()
+        git(self.repo, "init", "-q", "-b", "main")
+        git(self.repo, "config", "user.email", "t@example.com")
+        git(self.repo, "config", "user.name", "t")
+
+    def tearDown(self):
+        shutil.rmtree(self.repo, ignore_errors=True)
+
+    def _write(self, name, text):
+        with open(os.path.join(self.repo, name), "w") as fh:
+            fh.write(text)
+
+    def test_snapshot_sets(self):
+        self.assertIsNone(git_adapter.status(self.repo).head)
+        for name in ("a.txt", "b.txt", "c.txt"):
+            self._write(name, name)
+        git(self.repo, "add", ".")
+        git(self.repo, "commit", "-q", "-m", "init")
+        git(self.repo, "mv", "a.txt", "renamed file.txt")
+        self._write("b.txt", "changed")
+        self._write("new.txt", "new")
+        self._write("c.txt", "staged")
+        git(self.repo, "add", "c.txt")
+        snap = git_adapter.status(self.repo)
+        self.assertEqual(snap.head, git(self.repo, "rev-parse", "HEAD"))
+        self.assertEqual(snap.branch, "main")
+        self.assertEqual(sorted(snap.staged), ["c.txt", "renamed file.txt"])
+        self.assertEqual(snap.unstaged, ["b.txt"])
+        self.assertEqual(snap.untracked, ["new.txt"])
+        self.assertEqual(snap.unmerged, [])
+
+    def test_unmerged_and_cache_invalidation(self):
+        self._write("a.txt", "base")
+        git(self.repo, "add", ".")
+        git(self.repo, "commit", "-q", "-m", "base")
+        git(self.repo, "checkout", "-q", "-b", "other")
+        self._write("a.txt", "other")
+        git(self.repo, "commit", "-q", "-am", "other")
+        git(self.repo, "checkout", "-q", "main")
+        self._write("a.txt", "main")
+        git(self.repo, "commit", "-q", "-am", "main")
+        cache = git_adapter.StatusCache(self.repo)
+        first = cache.get()
+        self.assertIs(cache.get(), first)
+        git(self.repo, "merge", "other")
+        self.assertEqual(cache.get().unmerged, ["a.txt"])
+        self._write("b.txt", "b")
+        self.assertEqual(cache.get().untracked, [])
+        cache.invalidate()
+        self.assertEqual(cache.get().untracked, ["b.txt"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import unittest
+
+from fwgp import git_adapter
+
+
+def git(cwd, *args):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+class TestGitWorker(unittest.TestCase):
+    def setUp(self):
+        self.repo = tempfile.mkdtemp()
+        git(self.repo, "init", "-q")
+        git(self.repo, "config", "user.email", "t@example.com")
+        git(self.repo, "config", "user.name", "t")
+        self.worker = git_adapter.GitWorker(self.repo)
+
+    def tearDown(self):
+        self.worker.close()
+        shutil.rmtree(self.repo, ignore_errors=True)
+
+    def _write(self, name, text):
+        with open(os.path.join(self.repo, name), "w") as fh:
+            fh.write(text)
+
+    def test_sees_refs_and_objects_written_after_start(self):
+        self.assertIsNone(git_adapter.head_sha(self.repo, worker=self.worker))
+        self._write("a.txt", "one")
+        git_adapter.add(self.repo, ["a.txt"])
+        first = git_adapter.commit(self.repo, "one", worker=self.worker)
+        self.assertEqual(first, git(self.repo, "rev-parse", "HEAD"))
+        self._write("a.txt", "two")
+        git_adapter.add(self.repo, ["a.txt"])
+        second = git_adapter.commit(self.repo, "two", worker=self.worker)
+        self.assertNotEqual(first, second)
+        self.assertEqual(second, git(self.repo, "rev-parse", "HEAD"))
+        self.assertEqual(self.worker.read_object("HEAD:a.txt"), b"two")
+        self.assertEqual(self.worker.object_info("HEAD:a.txt")[1:], ("blob", 3))
+
+    def test_respawns_dead_process(self):
+        self._write("a.txt", "one")
+        git_adapter.add(self.repo, ["a.txt"])
+        sha = git_adapter.commit(self.repo, "one")
+        self.assertEqual(self.worker.resolve("HEAD"), sha)
+        self.worker._procs["--batch-check"].kill()
+        self.worker._procs["--batch-check"].wait()
+        self.assertEqual(self.worker.resolve("HEAD"), sha)
+
+    def test_hung_process_is_killed_after_timeout(self):
+        self._write("a.txt", "one")
+        git_adapter.add(self.repo, ["a.txt"])
+        sha = git_adapter.commit(self.repo, "one")
+        self.worker.timeout_sec = 0.2
+        # A process that reads requests but never answers
+        self.worker._procs["--batch-check"] = subprocess.Popen(
+            ["sleep", "30"], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        started = time.monotonic()
+        self.assertEqual(self.worker.resolve("HEAD"), sha)
+        self.assertLess(time.monotonic() - started, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
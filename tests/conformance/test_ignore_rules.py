@@ -0,0 +1,102 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from fwgp.ignore import IgnoreRules
+from fwgp.watcher import IncrementalPollingWatcher, PollingWatcher
+
+
+class TestIgnoreRules(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.root, ".git", "info"))
+        with open(os.path.join(self.root, ".gitignore"), "w") as fh:
+            fh.write("# deps\nnode_modules/\n*.log\n!keep.log\n/build\ndocs/**/*.tmp\n")
+        with open(os.path.join(self.root, ".git", "info", "exclude"), "w") as fh:
+            fh.write(".venv\n")
+        for rel in ("src/a.py", "src/node_modules/x.js", "build/out.o", "src/build/ok.py",
+                    "debug.log", "keep.log", "docs/a/b/c.tmp", "docs/c.md", ".venv/lib.py"):
+            p = os.path.join(self.root, *rel.split("/"))
+            os.makedirs(os.path.dirname(p), exist_ok=True)
+            with open(p, "w") as fh:
+                fh.write("x")
+        self.rules = IgnoreRules(self.root)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_match_semantics(self):
+        m = self.rules.match
+        self.assertTrue(m("src/node_modules", True))
+        self.assertFalse(m("node_modules", False))
+        self.assertTrue(m("debug.log", False))
+        self.assertFalse(m("keep.log", False))
+        self.assertTrue(m("build", True))
+        self.assertFalse(m("src/build", True))
+        self.assertTrue(m("docs/a/b/c.tmp", False))
+        self.assertTrue(m(".venv", True))
+        self.assertTrue(self.rules.is_ignored_tree(os.path.join(self.root, "src", "node_modules", "x.js")))
+
+    def test_watchers_prune_ignored_trees(self):
+        expected = {"src/a.py", "src/build/ok.py", "keep.log", "docs/c.md", ".gitignore"}
+        for cls in (PollingWatcher, IncrementalPollingWatcher):
+            # No initial scan: every visible file is reported as created
+            seen = {e.path for e in cls(self.root, ignore=self.rules).poll_changes()}
+            rel = {os.path.relpath(p, self.root).replace(os.sep, "/") for p in seen}
+            self.assertEqual(rel, expected, cls.__name__)
+
+    def test_rules_recompile_when_gitignore_changes(self):
+        self.assertFalse(self.rules.refresh())
+        with open(os.path.join(self.root, ".gitignore"), "a") as fh:
+            fh.write("*.md\n")
+        self.assertTrue(self.rules.refresh())
+        self.assertTrue(self.rules.match("docs/c.md", False))
+
+
+class TestTrackedFilesAreNotIgnored(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, True)
+        self._git("init", "-q")
+        for rel in ("dist/app.js", "keep.log", "src/a.py"):
+            self._write(rel)
+        self._git("add", ".")
+        self._write(".gitignore", "dist/\n*.log\n")
+        for rel in ("dist/new.js", "dist/sub/x.js", "debug.log"):
+            self._write(rel)
+
+    def _git(self, *args):
+        subprocess.run(["git", *args], cwd=self.root, check=True, capture_output=True)
+
+    def _write(self, rel, text="x"):
+        p = os.path.join(self.root, *rel.split("/"))
+        os.makedirs(os.path.dirname(p), exist_ok=True)
+        with open(p, "w") as fh:
+            fh.write(text)
+
+    def test_tracked_paths_are_walked_and_reported(self):
+        rules = IgnoreRules(self.root)
+        self.assertFalse(rules.is_ignored_tree(os.path.join(self.root, "dist", "app.js")))
+        self.assertTrue(rules.is_ignored_tree(os.path.join(self.root, "dist", "new.js")))
+        self.assertTrue(rules.is_ignored_tree(os.path.join(self.root, "dist", "sub", "x.js")))
+        expected = {"dist/app.js", "keep.log", "src/a.py", ".gitignore"}
+        for cls in (PollingWatcher, IncrementalPollingWatcher):
+            seen = {e.path for e in cls(self.root, ignore=rules).poll_changes()}
+            rel = {os.path.relpath(p, self.root).replace(os.sep, "/") for p in seen}
+            self.assertEqual(rel, expected, cls.__name__)
+
+    def test_refresh_follows_the_index(self):
+        rules = IgnoreRules(self.root)
+        self.assertFalse(rules.refresh())
+        self._git("add", "-f", "debug.log")
+        self.assertTrue(rules.refresh())
+        self.assertFalse(rules.is_ignored(os.path.join(self.root, "debug.log")))
+        self._write("src/b.py")
+        self._git("add", "src/b.py")
+        self.assertFalse(rules.refresh())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import time
+import unittest
+
+from fwgp import events
+from fwgp.pipeline import BatchPolicy, Pipeline
+
+
+class DummyLogger:
+    def info(self, *a, **k):
+        pass
+    def warning(self, *a, **k):
+        pass
+    def error(self, *a, **k):
+        pass
+
+
+class RecordingDispatcher:
+    def __init__(self):
+        self.detected = []
+
+    def on_files_detected(self, evts, ctx):
+        self.detected.extend(e.path for e in evts)
+
+
+def _evt(path):
+    return events.FileDetectedEvent(path, events.ChangeType.MODIFIED, time.time(), "/repo")
+
+
+class TestPipelineBatching(unittest.TestCase):
+    def _pipeline(self, policy):
+        pipe = Pipeline("/repo", RecordingDispatcher(), DummyLogger(), batch_policy=policy)
+        pipe.batches = []
+        pipe._stage_commit_push = lambda changes, ctx: pipe.batches.append(sorted(e.path for e in changes))
+        return pipe
+
+    def test_default_policy_commits_every_change(self):
+        pipe = self._pipeline(None)
+        pipe._process_changes([_evt("a")], {})
+        pipe._process_changes([_evt("b")], {})
+        self.assertEqual(pipe.batches, [["a"], ["b"]])
+
+    def test_max_files_flushes_one_batch(self):
+        pipe = self._pipeline(BatchPolicy(max_wait_sec=60, max_files=3))
+        pipe._process_changes([_evt("a"), _evt("b")], {})
+        pipe._process_changes([_evt("a")], {})
+        self.assertEqual(pipe.batches, [])
+        pipe._process_changes([_evt("c")], {})
+        self.assertEqual(pipe.batches, [["a", "b", "c"]])
+        self.assertEqual(pipe.dispatcher.detected, ["a", "b", "a", "c"])
+
+    def test_max_wait_and_max_bytes(self):
+        pipe = self._pipeline(BatchPolicy(max_wait_sec=0.1))
+        pipe._process_changes([_evt("a")], {})
+        self.assertFalse(pipe._batch_due())
+        time.sleep(0.12)
+        self.assertTrue(pipe._batch_due())
+
+        with tempfile.NamedTemporaryFile(delete=False) as fh:
+            fh.write(b"x" * 2048)
+        try:
+            pipe = self._pipeline(BatchPolicy(max_wait_sec=60, max_bytes=1024))
+            pipe._process_changes([_evt(fh.name)], {})
+            self.assertEqual(pipe.batches, [[fh.name]])
+        finally:
+            os.unlink(fh.name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import unittest
+
+from fwgp import events, git_adapter
+from fwgp.dispatcher import Dispatcher
+from fwgp.pipeline import Pipeline
+from fwgp.state import StateStore
+
+
+class DummyLogger:
+    def info(self, *a, **k):
+        pass
+    def warning(self, *a, **k):
+        pass
+    def error(self, *a, **k):
+        pass
+
+
+def git(cwd, *args):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+def clone(origin, path):
+    git(os.path.dirname(path), "clone", "-q", origin, path)
+    git(path, "config", "user.email", "t@example.com")
+    git(path, "config", "user.name", "t")
+    git(path, "checkout", "-q", "-B", "main")
+
+
+def commit_file(repo, name, text):
+    with open(os.path.join(repo, name), "w") as fh:
+        fh.write(text)
+    git(repo, "add", name)
+    git(repo, "commit", "-q", "-m", name)
+
+
+class TestPipelineRemoteSync(unittest.TestCase):
+    def setUp(self):
+        self.base = tempfile.mkdtemp()
+        self.origin = os.path.join(self.base, "origin.git")
+        git(self.base, "init", "-q", "--bare", self.origin)
+        git(self.origin, "symbolic-ref", "HEAD", "refs/heads/main")
+        self.local = os.path.join(self.base, "local")
+        self.peer = os.path.join(self.base, "peer")
+        clone(self.origin, self.peer)
+        commit_file(self.peer, "a.txt", "a")
+        git(self.peer, "push", "-q", "origin", "main")
+        clone(self.origin, self.local)
+        disp = Dispatcher(StateStore(self.base), DummyLogger())
+        self.pipe = Pipeline(self.local, disp, DummyLogger())
+        self.ctx = dict(self.pipe._ctx(), remote="origin", branch="main")
+
+    def tearDown(self):
+        shutil.rmtree(self.base, ignore_errors=True)
+
+    def test_fast_forwards_only_when_remote_moved(self):
+        commit_file(self.peer, "b.txt", "b")
+        git(self.peer, "push", "-q", "origin", "main")
+        self.assertTrue(self.pipe._sync_remote(self.ctx))
+        self.assertTrue(os.path.exists(os.path.join(self.local, "b.txt")))
+        self.assertEqual(git_adapter.head_sha(self.local), git_adapter.head_sha(self.peer))
+        self.assertFalse(self.pipe._sync_remote(self.ctx))
+
+    def test_diverged_history_is_merged(self):
+        commit_file(self.peer, "b.txt", "b")
+        git(self.peer, "push", "-q", "origin", "main")
+        commit_file(self.local, "c.txt", "c")
+        self.assertTrue(self.pipe._sync_remote(self.ctx))
+        for name in ("b.txt", "c.txt"):
+            self.assertTrue(os.path.exists(os.path.join(self.local, name)))
+
+    def test_failed_add_keeps_batch(self):
+        path = os.path.join(self.local, "d.txt")
+        with open(path, "w") as fh:
+            fh.write("d")
+        lock = os.path.join(self.local, ".git", "index.lock")
+        open(lock, "w").close()
+        evt = events.FileDetectedEvent(path, events.ChangeType.CREATED, time.time(), self.local)
+        before = git_adapter.head_sha(self.local)
+        self.pipe._process_changes([evt], self.pipe._ctx())
+        self.assertEqual(git_adapter.head_sha(self.local), before)
+        self.assertEqual(list(self.pipe._batch), [path])
+        os.unlink(lock)
+        self.pipe._flush_batch(self.pipe._ctx())
+        self.assertFalse(self.pipe._batch)
+        self.assertNotEqual(git_adapter.head_sha(self.local), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import threading
+import time
+import unittest
+
+from fwgp.pipeline import Pipeline
+
+
+class DummyLogger:
+    def info(self, *a, **k):
+        pass
+    def warning(self, *a, **k):
+        pass
+    def error(self, *a, **k):
+        pass
+
+
+class EventWatcher:
+    def __init__(self):
+        self.ready = threading.Event()
+        self.waits = []
+
+    def wait_for_changes(self, timeout):
+        self.waits.append(timeout)
+        return self.ready.wait(timeout)
+
+    def poll_changes(self):
+        if self.ready.is_set():
+            self.ready.clear()
+            return ["evt"]
+        return []
+
+
+class TestPipelineScheduler(unittest.TestCase):
+    def _pipeline(self, watcher):
+        pipe = Pipeline("/repo", None, DummyLogger(), interval_sec=0.05, watcher=watcher,
+                        sync_interval_sec=0.05, max_sync_interval_sec=0.4)
+        pipe.syncs = 0
+        pipe.processed = []
+
+        def sync(ctx):
+            pipe.syncs += 1
+            return False
+        pipe._sync_remote = sync
+        pipe._process_changes = lambda changes, ctx: pipe.processed.append(time.monotonic())
+        return pipe
+
+    def test_remote_sync_backs_off_when_idle(self):
+        pipe = self._pipeline(EventWatcher())
+        t = threading.Thread(target=pipe.start)
+        t.start()
+        time.sleep(1.0)
+        pipe.stop()
+        t.join(2)
+        # 0.05 + 0.1 + 0.2 + 0.4 + 0.4 ... instead of one sync per 50 ms
+        self.assertLessEqual(pipe.syncs, 6)
+        self.assertGreaterEqual(pipe.syncs, 3)
+
+    def test_changes_are_processed_on_watcher_readiness(self):
+        watcher = EventWatcher()
+        pipe = self._pipeline(watcher)
+        t = threading.Thread(target=pipe.start)
+        t.start()
+        time.sleep(0.5)
+        fired = time.monotonic()
+        watcher.ready.set()
+        time.sleep(0.2)
+        pipe.stop()
+        watcher.ready.set()
+        t.join(2)
+        self.assertTrue(pipe.processed)
+        self.assertLess(pipe.processed[0] - fired, 0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import tempfile
+import threading
+import time
+import unittest
+
+from fwgp import events
+from fwgp.dispatcher import Dispatcher
+from fwgp.plugins.base import BasePlugin, PluginManifest
+from fwgp.policy import PerformancePolicy
+from fwgp.state import StateStore
+
+
+class DummyLogger:
+    def info(self, *a, **k):
+        pass
+    def warning(self, *a, **k):
+        pass
+    def error(self, *a, **k):
+        pass
+
+
+class Budgeted:
+    manifest = PluginManifest(name="Budgeted", budgets={"latency_ms": {"default": 50, "max": 300},
+                                                        "max_concurrency": 1})
+    entered = threading.Event()
+
+    def beforeStage(self, req, ctx):
+        Budgeted.entered.set()
+        time.sleep(float(req.paths[0]))
+        return events.StageDecision(allow=True)
+
+
+class Watcher(BasePlugin):
+    seen = []
+
+    def onBudgetViolation(self, violation, ctx):
+        Watcher.seen.append((violation.plugin, violation.kind))
+
+
+SPEC = __name__ + ":Budgeted"
+
+
+def _stage(seconds):
+    return events.StageRequest(paths=[str(seconds)], repo="r", ctx={})
+
+
+class TestPluginBudgets(unittest.TestCase):
+    def setUp(self):
+        Watcher.seen = []
+        self.disp = Dispatcher(StateStore(tempfile.mkdtemp()), DummyLogger(),
+                               policy=PerformancePolicy(latency_max_ms=1500, max_concurrency=4))
+        self.disp.load_plugins([SPEC, __name__ + ":Watcher"])
+
+    def test_budgets_merge_policy_and_manifest(self):
+        self.assertEqual(self.disp.timeout_sec, 1.5)
+        budget = self.disp.budget_for({"max_concurrency": 9})
+        self.assertEqual((budget.timeout_ms, budget.max_concurrency), (1500.0, 4))
+        budget = self.disp._budgets[SPEC]
+        self.assertEqual((budget.latency_ms, budget.timeout_ms, budget.max_concurrency), (50.0, 300.0, 1))
+
+    def test_latency_timeout_and_concurrency_violations(self):
+        self.disp.before_stage(_stage(0.1), {})
+        self.disp.before_stage(_stage(1.0), {})
+        self.assertTrue(self.disp.drain_notifications(timeout=2))
+        self.assertEqual(Watcher.seen, [(SPEC, "latency"), (SPEC, "timeout")])
+        # The timed-out call still holds the only slot
+        started = time.monotonic()
+        self.disp.before_stage(_stage(0), {})
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(self.disp.metrics.violations[(SPEC, "concurrency")], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import time
+import unittest
+
+from fwgp import events
+from fwgp.dispatcher import Dispatcher
+from fwgp.isolation import ProcessPlugin
+from fwgp.policy import PerformancePolicy, load_performance_policy
+from fwgp.state import StateStore
+
+
+class DummyLogger:
+    def info(self, *a, **k):
+        pass
+    def warning(self, *a, **k):
+        pass
+    def error(self, *a, **k):
+        pass
+
+
+class Hanging:
+    def beforeCommit(self, req, ctx):
+        if req.staged_summary == ["hang"]:
+            time.sleep(60)
+        return events.CommitDecision(allow=True, message_override="pid %d" % os.getpid())
+
+
+SPEC = __name__ + ":Hanging"
+
+
+class TestPluginIsolation(unittest.TestCase):
+    def test_hung_plugin_is_killed_and_respawned(self):
+        disp = Dispatcher(StateStore(tempfile.mkdtemp()), DummyLogger(), timeout_sec=0.5,
+                          max_workers=1, isolation="process")
+        disp.load_plugins([SPEC])
+        try:
+            _, first, _ = disp.before_commit(events.CommitRequest(staged_summary=["ok"], repo="r"), {})
+            self.assertNotEqual(first, "pid %d" % os.getpid())
+            started = time.monotonic()
+            _, msg, _ = disp.before_commit(events.CommitRequest(staged_summary=["hang"], repo="r"), {})
+            self.assertIsNone(msg)
+            # The single pool thread is free again and the worker was replaced
+            _, second, _ = disp.before_commit(events.CommitRequest(staged_summary=["ok"], repo="r"), {})
+            self.assertLess(time.monotonic() - started, 3)
+            self.assertIsNotNone(second)
+            self.assertNotEqual(first, second)
+            self.assertEqual(disp.plugins[0].instance.restarts, 1)
+            self.assertEqual(disp.state.circuit(SPEC, "beforeCommit").failures, 1)
+        finally:
+            disp.close_plugins()
+
+    def test_memory_budget_ignores_parent_footprint(self):
+        # A forked worker would inherit this allocation in its peak RSS
+        ballast = b"x" * (200 << 20)
+        readings = []
+        plugin = ProcessPlugin(SPEC, 5.0, max_memory_mb=150, on_rss=lambda method, rss: readings.append(rss))
+        try:
+            for _ in range(2):
+                plugin.call("beforeCommit", events.CommitRequest(staged_summary=["ok"], repo="r"), {})
+            self.assertEqual(plugin.restarts, 0)
+            self.assertTrue(all(rss < 150 for rss in readings))
+        finally:
+            plugin.close()
+            del ballast
+
+    def test_policy_concurrency_from_repo_file(self):
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        policy = load_performance_policy(os.path.join(root, "policy", "performance.yml"))
+        self.assertEqual((policy.latency_max_ms, policy.max_concurrency, policy.plugin_workers), (5000.0, 5, 1))
+        self.assertEqual(load_performance_policy("/nonexistent.yml"), PerformancePolicy())
+
+
+if __name__ == "__main__":
+    unittest.main()
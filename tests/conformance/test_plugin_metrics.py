@@ -0,0 +1,53 @@
+import tempfile
+import time
+import unittest
+
+from fwgp import events
+from fwgp.dispatcher import Dispatcher, LoadedPlugin
+from fwgp.metrics import PluginMetrics
+from fwgp.state import StateStore
+
+
+class DummyLogger:
+    def info(self, *a, **k):
+        pass
+    def warning(self, *a, **k):
+        pass
+    def error(self, *a, **k):
+        pass
+
+
+class Mixed:
+    def beforeStage(self, req, ctx):
+        if req.paths == ["slow"]:
+            time.sleep(0.3)
+        if req.paths == ["boom"]:
+            raise ValueError("boom")
+        return events.StageDecision(allow=True)
+
+
+class TestPluginMetrics(unittest.TestCase):
+    def test_records_latency_outcomes_and_trips(self):
+        base = tempfile.mkdtemp()
+        metrics = PluginMetrics(base, flush_interval_sec=0)
+        disp = Dispatcher(StateStore(base), DummyLogger(), timeout_sec=0.1, metrics=metrics)
+        disp.plugins = [LoadedPlugin(key="mixed", instance=Mixed())]
+        for paths in (["ok"], ["boom"], ["slow"], ["boom"]):
+            disp.before_stage(events.StageRequest(paths=paths, repo="r", ctx={}), {})
+        time.sleep(0.3)  # let the timed-out call finish and be observed
+
+        st = metrics.get("mixed", "beforeStage")
+        self.assertEqual((st.calls, st.errors, st.timeouts), (4, 2, 1))
+        self.assertEqual(metrics.trips, {"mixed": 1})
+        self.assertEqual(st.quantile_ms(0.5), 5.0)
+        self.assertEqual(st.quantile_ms(1.0), 500.0)
+
+        metrics.flush()
+        text = (metrics.path).read_text(encoding="utf-8")
+        self.assertIn('fwgp_plugin_hook_latency_ms_bucket{plugin="mixed",hook="beforeStage",le="+Inf"} 4', text)
+        self.assertIn('fwgp_plugin_hook_timeouts_total{plugin="mixed",hook="beforeStage"} 1', text)
+        self.assertIn('fwgp_plugin_circuit_trips_total{plugin="mixed"} 1', text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from fwgp import events
+from fwgp.plugins import secrets_scanner
+from fwgp.plugins.secrets_scanner import SecretsScanner
+
+
+KEY = b"AKIA" + b"ABCDEFGHIJKLMNOP"
+
+
+class TestSecretsScanner(unittest.TestCase):
+    def setUp(self):
+        self.repo = tempfile.mkdtemp()
+
+    def _write(self, rel, data: bytes):
+        with open(os.path.join(self.repo, rel), "wb") as fh:
+            fh.write(data)
+        return rel
+
+    def _allowed(self, scanner, *rels):
+        req = events.CommitRequest(staged_summary=list(rels), repo=self.repo)
+        return scanner.beforeCommit(req, {"repo_path": self.repo}).allow
+
+    def test_secret_across_chunk_boundary(self):
+        rel = self._write("a.txt", b"x" * 1000 + KEY + b"\n")
+        self.assertFalse(self._allowed(SecretsScanner(chunk_size=1010), rel))
+
+    def test_clean_file_allowed(self):
+        rel = self._write("a.txt", b"nothing to see\n" * 1000)
+        self.assertTrue(self._allowed(SecretsScanner(chunk_size=256), rel))
+
+    def test_binary_is_skipped(self):
+        rel = self._write("a.bin", b"\0\1\2" + KEY)
+        self.assertTrue(self._allowed(SecretsScanner(), rel))
+
+    def test_byte_budget_limits_scan(self):
+        rel = self._write("big.txt", b"x" * 4096 + KEY)
+        self.assertTrue(self._allowed(SecretsScanner(chunk_size=512, max_scan_bytes=4096), rel))
+        self.assertFalse(self._allowed(SecretsScanner(chunk_size=512, max_scan_bytes=8192), rel))
+
+    def test_large_files_are_mapped(self):
+        rel = self._write("big.txt", b"y" * 50000 + KEY)
+        with mock.patch.object(secrets_scanner, "MMAP_THRESHOLD", 1024), \
+                mock.patch.object(secrets_scanner, "scan_stream", side_effect=AssertionError):
+            self.assertFalse(self._allowed(SecretsScanner(), rel))
+
+
+class TestRuleSet(unittest.TestCase):
+    def test_reports_rule_and_offsets(self):
+        buf = b'x = 1\napi_key = "abcdefghijklmnopqrst"\n' + KEY
+        found = [(m.rule, m.start) for m in secrets_scanner.SECRET_RULES.finditer(buf)]
+        self.assertEqual(found, [("generic-api-key", 6), ("aws-access-key-id", len(buf) - len(KEY))])
+
+    def test_overlapping_keywords_and_loose_rules(self):
+        rules = secrets_scanner.RuleSet([
+            secrets_scanner.SecretRule("short", rb"SK[0-9a-f]{4}", keywords=(b"SK",)),
+            secrets_scanner.SecretRule("long", rb"sk_live_[0-9a-z]{4}", keywords=(b"sk_live_",)),
+            secrets_scanner.SecretRule("loose", rb"[0-9]{3}-[0-9]{4}"),
+        ])
+        found = [(m.rule, m.start) for m in rules.finditer(b"sk_live_abcd SK12ab 555-1234", offset=100)]
+        self.assertEqual(found, [("long", 100), ("short", 113), ("loose", 120)])
+
+    def test_stream_offsets_are_absolute(self):
+        data = b"y" * 3000 + KEY
+        found = secrets_scanner.scan_stream(io.BytesIO(data), chunk_size=1024)
+        self.assertEqual((found.rule, found.start), ("aws-access-key-id", 3000))
+
+    def test_leading_inline_flags_in_loose_rules(self):
+        rules = secrets_scanner.RuleSet([
+            secrets_scanner.SecretRule("flagged", rb"(?i)token=[0-9]{4}"),
+            secrets_scanner.SecretRule("plain", rb"pin=[0-9]{4}", ignore_case=True),
+        ])
+        found = [(m.rule, m.start) for m in rules.finditer(b"TOKEN=1234 PIN=5678")]
+        self.assertEqual(found, [("flagged", 0), ("plain", 11)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import gc
+import json
+import tempfile
+import threading
+import time
+import unittest
+import weakref
+from pathlib import Path
+from unittest import mock
+
+from fwgp.state import BreakerPolicy, StateStore
+
+
+KEY = "plugins.sample:Plugin"
+HOOK = "beforeCommit"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.base = tempfile.mkdtemp()
+        self.clock = Clock()
+        patcher = mock.patch("fwgp.state.time.time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.state = StateStore(self.base, BreakerPolicy(window_sec=10, min_failures=3, failure_rate=0.5,
+                                                         cooldown_sec=5, max_cooldown_sec=15),
+                                flush_interval_sec=60)
+        self.addCleanup(self.state.close)
+
+    def _fail(self, n, hook=HOOK):
+        for _ in range(n):
+            self.state.record_failure(KEY, hook)
+
+    def test_failures_outside_window_do_not_trip(self):
+        self._fail(2)
+        self.clock.now += 11
+        self._fail(2)
+        self.assertFalse(self.state.is_disabled(KEY, HOOK))
+        self._fail(1)
+        self.assertTrue(self.state.is_disabled(KEY, HOOK))
+
+    def test_failure_rate_must_be_reached(self):
+        for _ in range(4):
+            self.state.record_success(KEY, HOOK)
+        self._fail(3)
+        self.assertFalse(self.state.is_disabled(KEY, HOOK))
+        self._fail(1)
+        self.assertTrue(self.state.is_disabled(KEY, HOOK))
+
+    def test_half_open_probe_recovers(self):
+        self._fail(3)
+        self.assertFalse(self.state.allow(KEY, HOOK))
+        self.clock.now += 5
+        self.assertTrue(self.state.allow(KEY, HOOK))
+        # Only one probe at a time
+        self.assertFalse(self.state.allow(KEY, HOOK))
+        self.state.record_success(KEY, HOOK)
+        self.assertFalse(self.state.is_disabled(KEY, HOOK))
+        self.assertTrue(self.state.allow(KEY, HOOK))
+
+    def test_failed_probe_doubles_cooldown(self):
+        self._fail(3)
+        for expected in (10, 15):
+            self.clock.now += 20
+            self.assertTrue(self.state.allow(KEY, HOOK))
+            self._fail(1)
+            self.assertEqual(self.state.circuit(KEY, HOOK).cooldown_sec, expected)
+            self.assertTrue(self.state.is_open(KEY, HOOK))
+        self.assertEqual(self.state.circuit(KEY, HOOK).trips, 3)
+
+    def test_hooks_trip_independently(self):
+        self._fail(3, hook="onFileDetected")
+        self.assertTrue(self.state.is_open(KEY, "onFileDetected"))
+        self.assertFalse(self.state.is_open(KEY, HOOK))
+        self.assertTrue(self.state.is_disabled(KEY))
+        self.state.reset(KEY)
+        self.assertFalse(self.state.is_disabled(KEY))
+
+
+class TestWriteBehind(unittest.TestCase):
+    def test_updates_are_batched_and_merged_on_flush(self):
+        base = tempfile.mkdtemp()
+        path = Path(base) / "data" / "state.json"
+        a = StateStore(base, flush_interval_sec=60)
+        b = StateStore(base, flush_interval_sec=60)
+        a.record_failure("a:A", HOOK)
+        b.record_failure("b:B", HOOK)
+        self.assertFalse(path.exists())
+        a.close()
+        b.close()
+        circuits = json.loads(path.read_text(encoding="utf-8"))["circuits"]
+        self.assertEqual(circuits["a:A#beforeCommit"]["failures"], 1)
+        self.assertEqual(circuits["b:B#beforeCommit"]["failures"], 1)
+        self.assertEqual(StateStore(base).circuit("a:A", HOOK).failures, 1)
+        self.assertEqual([p.name for p in path.parent.glob(".state.json.*")], [])
+
+    def test_interval_flush(self):
+        base = tempfile.mkdtemp()
+        state = StateStore(base, flush_interval_sec=0.05)
+        state.record_failure(KEY, HOOK)
+        path = Path(base) / "data" / "state.json"
+        deadline = time.monotonic() + 2
+        while not path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(path.exists())
+        state.close()
+
+    def test_concurrent_flushes_persist_in_order(self):
+        state = StateStore(tempfile.mkdtemp(), flush_interval_sec=60)
+        written = []
+        entered = threading.Event()
+
+        def persist(changes):
+            if not entered.is_set():
+                entered.set()
+                time.sleep(0.2)
+            written.append(changes[KEY + "#" + HOOK]["failures"])
+        state._persist = persist
+        state.record_failure(KEY, HOOK)
+        t = threading.Thread(target=state.flush)
+        t.start()
+        self.assertTrue(entered.wait(2))
+        state.record_failure(KEY, HOOK)
+        state.flush()
+        t.join()
+        self.assertEqual(written, [1, 2])
+        state.close()
+
+    def test_closed_store_is_not_kept_alive(self):
+        state = StateStore(tempfile.mkdtemp(), flush_interval_sec=60)
+        ref = weakref.ref(state)
+        state.close()
+        del state
+        gc.collect()
+        self.assertIsNone(ref())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from fwgp.state import JournalStateStore
+
+
+HOOK = "beforeCommit"
+
+
+class TestJournalStateStore(unittest.TestCase):
+    def setUp(self):
+        self.base = tempfile.mkdtemp()
+        self.data = Path(self.base) / "data"
+
+    def test_flush_appends_only_changed_circuits(self):
+        state = JournalStateStore(self.base, flush_interval_sec=60)
+        for name in ("a:A", "b:B", "c:C"):
+            state.record_failure(name, HOOK)
+        state.flush()
+        state.record_failure("b:B", HOOK)
+        state.close()
+        lines = (self.data / "state.journal").read_text(encoding="utf-8").splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(json.loads(lines[-1])["k"], "b:B#beforeCommit")
+        self.assertFalse((self.data / "state.json").exists())
+        self.assertEqual(JournalStateStore(self.base).circuit("b:B", HOOK).failures, 2)
+
+    def test_compaction_folds_journal_into_snapshot(self):
+        state = JournalStateStore(self.base, flush_interval_sec=60, compact_bytes=1)
+        state.record_failure("a:A", HOOK)
+        state.flush()
+        state.record_failure("b:B", HOOK)
+        state.close()
+        self.assertEqual((self.data / "state.journal").stat().st_size, 0)
+        circuits = json.loads((self.data / "state.json").read_text(encoding="utf-8"))["circuits"]
+        self.assertEqual(set(circuits), {"a:A#beforeCommit", "b:B#beforeCommit"})
+        self.assertEqual(JournalStateStore(self.base).circuit("a:A", HOOK).failures, 1)
+
+    def test_torn_record_is_skipped(self):
+        state = JournalStateStore(self.base, flush_interval_sec=60)
+        state.record_failure("a:A", HOOK)
+        state.flush()
+        with open(self.data / "state.journal", "a", encoding="utf-8") as fh:
+            fh.write('{"k":"a:A#beforeCommit","v":{"fail')
+        state.record_failure("b:B", HOOK)
+        state.close()
+        replayed = JournalStateStore(self.base)
+        self.assertEqual(replayed.circuit("a:A", HOOK).failures, 1)
+        self.assertEqual(replayed.circuit("b:B", HOOK).failures, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import asyncio
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import unittest
+
+from fwgp import events
+from fwgp.config import Config, RepoConfig, load_config, save_config
+from fwgp.dispatcher import Dispatcher, LoadedPlugin
+from fwgp.state import StateStore
+from fwgp.supervisor import Supervisor
+
+
+class DummyLogger:
+    def info(self, *a, **k):
+        pass
+    def warning(self, *a, **k):
+        pass
+    def error(self, *a, **k):
+        pass
+
+
+def git(cwd, *args):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+class ListWatcher:
+    def __init__(self, changes):
+        self.changes = changes
+
+    def poll_changes(self):
+        changes, self.changes = self.changes, []
+        return changes
+
+
+class FailsOnRepoA:
+    def beforeStage(self, req, ctx):
+        if ctx["repo_path"] == "/a":
+            raise RuntimeError("boom")
+        return events.StageDecision(allow=False, reasons=["b"])
+
+
+class TestSupervisor(unittest.TestCase):
+    def setUp(self):
+        self.base = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.base, ignore_errors=True)
+
+    def test_repositories_round_trip_through_config(self):
+        cfg = Config(base_dir=self.base, repositories=[{"repo_path": "/a"}, RepoConfig("/b", branch="dev")])
+        save_config(cfg)
+        loaded = load_config(self.base)
+        self.assertEqual(loaded.repositories, [RepoConfig("/a"), RepoConfig("/b", branch="dev")])
+
+    def test_runs_every_repo_with_shared_limits(self):
+        repos = []
+        changes = {}
+        for i, count in enumerate((200, 1, 1)):
+            repo = os.path.join(self.base, "r%d" % i)
+            os.makedirs(repo)
+            git(repo, "init", "-q")
+            git(repo, "config", "user.email", "t@example.com")
+            git(repo, "config", "user.name", "t")
+            evts = []
+            for j in range(count):
+                path = os.path.join(repo, "f%d.txt" % j)
+                with open(path, "w") as fh:
+                    fh.write(str(j))
+                evts.append(events.FileDetectedEvent(path, events.ChangeType.CREATED, time.time(), repo))
+            changes[repo] = evts
+            repos.append(RepoConfig(repo, remote="", branch=""))
+        disp = Dispatcher(StateStore(self.base), DummyLogger())
+        sup = Supervisor(repos, disp, DummyLogger(), make_watcher=lambda r: ListWatcher(changes[r.repo_path]),
+                         git_max_concurrency=1, poll_workers=2, add_chunk_size=50, interval_sec=0.05)
+        self.assertTrue(all(p.agit is sup.git and p.dispatcher is disp for p in sup.pipelines))
+
+        async def main():
+            task = asyncio.create_task(sup.run())
+            await asyncio.sleep(1.5)
+            sup.stop()
+            await asyncio.wait_for(task, 5)
+
+        asyncio.run(main())
+        for repo, evts in changes.items():
+            self.assertEqual(len(git(repo, "ls-files").splitlines()), len(evts))
+
+    def test_circuits_are_kept_per_repo(self):
+        disp = Dispatcher(StateStore(self.base), DummyLogger())
+        disp.plugins = [LoadedPlugin(key="flaky", instance=FailsOnRepoA())]
+        Supervisor([RepoConfig("/a"), RepoConfig("/b")], disp, DummyLogger(), make_watcher=lambda r: ListWatcher([]))
+        req = events.StageRequest(paths=[], repo="", ctx={})
+        for _ in range(5):
+            disp.before_stage(req, {"repo_path": "/a"})
+        self.assertTrue(disp.state.is_open("flaky@/a", events.Hook.BEFORE_STAGE.value))
+        self.assertFalse(disp.state.is_disabled("flaky", events.Hook.BEFORE_STAGE.value))
+        self.assertEqual(disp.before_stage(req, {"repo_path": "/b"}), (False, ["b"]))
+        disp.state.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
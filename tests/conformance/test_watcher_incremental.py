@@ -0,0 +1,50 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from fwgp.events import ChangeType
+from fwgp.watcher import IncrementalPollingWatcher
+
+
+def _kinds(evts):
+    return {(os.path.basename(e.path), e.change_type) for e in evts}
+
+
+class TestIncrementalPollingWatcher(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.root, "sub", ".git"))
+        os.makedirs(os.path.join(self.root, ".git"))
+        for rel in ("a.txt", os.path.join("sub", "b.txt"), os.path.join(".git", "HEAD")):
+            with open(os.path.join(self.root, rel), "w") as fh:
+                fh.write("x")
+        self.w = IncrementalPollingWatcher(self.root, debounce_sec=0.0)
+        self.w.initial_scan()
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_idle_tick_is_empty(self):
+        self.assertEqual(self.w.poll_changes(), [])
+
+    def test_detects_create_modify_delete(self):
+        future = time.time() + 10
+        os.utime(os.path.join(self.root, "sub", "b.txt"), (future, future))
+        with open(os.path.join(self.root, "sub", "c.txt"), "w") as fh:
+            fh.write("y")
+        os.remove(os.path.join(self.root, "a.txt"))
+        self.assertEqual(
+            _kinds(self.w.poll_changes()),
+            {("b.txt", ChangeType.MODIFIED), ("c.txt", ChangeType.CREATED), ("a.txt", ChangeType.DELETED)},
+        )
+        self.assertEqual(self.w.poll_changes(), [])
+
+    def test_removed_directory_reports_its_files(self):
+        shutil.rmtree(os.path.join(self.root, "sub"))
+        self.assertEqual(_kinds(self.w.poll_changes()), {("b.txt", ChangeType.DELETED)})
+
+
+if __name__ == "__main__":
+    unittest.main()